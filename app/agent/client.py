@@ -1,19 +1,86 @@
 """Shared Anthropic client singleton and common agent utilities."""
 
+import logging
+from typing import Any
+
 import anthropic
+import httpx
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 _client: anthropic.AsyncAnthropic | None = None
 
 
 def get_client() -> anthropic.AsyncAnthropic:
     global _client
     if _client is None:
-        _client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        # The SDK's pool sizes are ample, but it drops idle connections after 5s — shorter than
+        # a typical pause between chat turns, so most turns would pay a fresh TLS handshake.
+        _client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=1000,
+                    max_keepalive_connections=100,
+                    keepalive_expiry=settings.anthropic_keepalive_seconds,
+                ),
+            ),
+        )
     return _client
 
 
+async def warmup() -> None:
+    """Open a keep-alive connection to the API so the first user turn skips DNS + TLS setup.
+
+    Uses the cheap models list endpoint. Failures are logged and ignored — a cold first
+    request is still a working one.
+    """
+    if not settings.anthropic_api_key:
+        return
+    try:
+        # Short timeout and no retries: an unreachable API must not hold up startup.
+        # with_options shares the underlying HTTP client, so the warmed connection is kept.
+        await get_client().with_options(timeout=5.0, max_retries=0).models.list(limit=1)
+        logger.info("Anthropic client warmed up")
+    except Exception as e:
+        logger.warning(f"Anthropic client warmup failed: {e}")
+
+
+async def close_client() -> None:
+    """Close the client's connection pool on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
 def tool_sig(name: str, args: dict) -> tuple:
-    """Stable hashable signature for a tool call — used for stuck loop detection."""
+    """Stable hashable signature for a tool call.
+
+    Used for stuck loop detection and as the key that coalesces identical read calls.
+    """
     return (name, tuple(sorted((k, str(v)) for k, v in args.items())))
+
+
+def mark_cache_breakpoint(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return messages with cache_control on the final content block.
+
+    Lets the growing tool_use/tool_result history be reused from the prompt cache on the
+    next turn. The stored message dicts are never mutated — the last message is copied —
+    so the marker can't leak into persisted history or pile up past the 4-breakpoint limit
+    (system blocks and tools already use three).
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    elif content:
+        blocks = list(content)
+    else:
+        return messages
+    blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+    return messages[:-1] + [{**last, "content": blocks}]
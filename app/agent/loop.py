@@ -10,15 +10,23 @@ from datetime import datetime
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from typing import Any, AsyncIterator
 
-from app.agent.client import get_client, tool_sig
-from app.agent.memory import format_for_prompt, load_memory, load_relevant_memory
+import cachetools
+
+from app.agent.client import get_client, mark_cache_breakpoint, tool_sig
+from app.agent.memory import format_for_prompt, load_relevant_memory
 from app.agent.session import compress_context
-from app.agent.tools import execute_tool, expand_tools, get_tool_schemas, select_tools
+from app.agent.tools import expand_tools, schedule_tools, select_tools
 from app.config import settings
 from app.db import get_pool
 
 logger = logging.getLogger(__name__)
 
+# Raw (pre-context-window) history of recently active sessions, keyed by session id.
+# Postgres stays the system of record: an entry is only trusted while its length matches
+# sessions.message_count, so writes from another instance or a deleted session fall back
+# to a reload.
+_history_cache: cachetools.LRUCache = cachetools.LRUCache(maxsize=settings.history_cache_size)
+
 
 async def _generate_session_title(pool, sid: uuid.UUID, user_message: str) -> None:
     """Fire-and-forget: generate a short title for a new session using Haiku."""
@@ -42,98 +50,139 @@ async def _generate_session_title(pool, sid: uuid.UUID, user_message: str) -> No
 
 
 def _select_model(
-    turn: int,
-    user_message_long: bool,
-    tools_used: list[str],
+    request_long: bool,
     force_sonnet: bool,
+    session_model: str | None = None,
 ) -> tuple[str, str]:
-    """Return (model_id, reason) for the current turn.
+    """Return (model_id, reason) for the current call.
 
-    Priority (highest first):
+    Prompt caches are per-model, so the model only changes between user turns; within a
+    request it is fixed except for an explicit escalation. Priority (highest first):
       1. Haiku explicitly requested escalation via request_escalation tool
-      2. Turn index >= sonnet_turn_threshold — deep multi-step chain
-      3. A write tool was used in a prior turn — synthesis needs precision
-      4. User message is long — signals a complex ask
-      5. Default — Haiku
+      2. Session escalated in an earlier request (sticky_session_model)
+      3. Long user message or long total context — signals a complex ask
+      4. Default — Haiku
+    Deep tool chains and write tools escalate the session from its next request on
+    (see _escalate_next_request) rather than switching mid-loop.
     """
     if force_sonnet:
         return settings.sonnet_model, "escalation_requested"
-    if turn >= settings.sonnet_turn_threshold:
-        return settings.sonnet_model, f"turn>={settings.sonnet_turn_threshold}"
-    if any(t in settings.sonnet_write_tools for t in tools_used):
-        return settings.sonnet_model, "write_tool_used"
-    if user_message_long:
-        return settings.sonnet_model, "long_message"
+    if settings.sticky_session_model and session_model == settings.sonnet_model:
+        return settings.sonnet_model, "session_sticky"
+    if request_long:
+        return settings.sonnet_model, "long_request"
     return settings.haiku_model, "default"
 
 
+def _request_long(user_message: str, messages: list[dict[str, Any]]) -> bool:
+    """Whether the new message or the whole context sent to the model is large.
+
+    Character counts stand in for tokens; list content is measured as its JSON text.
+    """
+    if len(user_message) >= settings.sonnet_message_len_threshold:
+        return True
+    context_chars = sum(
+        len(c) if isinstance(c, str) else len(json.dumps(c))
+        for c in (m["content"] for m in messages)
+    )
+    return context_chars >= settings.sonnet_context_chars_threshold
+
+
+def _escalate_next_request(turn: int, tools_used: list[str]) -> bool:
+    """Whether this request's tool loop means the session should use Sonnet from now on.
+
+    True once the loop is about to reach sonnet_turn_threshold or a write tool has run.
+    """
+    return turn + 1 >= settings.sonnet_turn_threshold or any(
+        t in settings.sonnet_write_tools for t in tools_used
+    )
+
+
+# Static prompt text — built once at import; only memory, location and mode vary per request.
+_BASE_PROMPT = (
+    "You are Sazed, a personal AI assistant.\n\n"
+    "## Behavior\n"
+    "- Be direct and concise. No preamble, no filler.\n"
+    "- Always use tools to get real data. Never answer from assumption when a tool can verify.\n"
+    "- Match response length to the question — short for simple answers, structured only when it genuinely helps.\n"
+    "- When a tool fails, say so clearly and suggest what to try instead.\n"
+    "- When the user asks you to remember something, call memory_update immediately.\n"
+    "- The user can always see what tools you use, so skip action telegraphing.\n\n"
+    "## Tools\n"
+    "You have tools for: calendar, tasks, email, Google Drive, GitHub, "
+    "Google Sheets, notifications, web search, places, and a personal knowledge base.\n\n"
+    "## Tool guidance\n"
+    "- Tasks: call get_task_lists first to get valid list IDs before creating, reading, or updating tasks.\n"
+    "- Drive files: call list_files to find a file ID before reading, updating, or deleting.\n"
+    "- Sheets: call get_spreadsheet_info first to confirm tab names and structure before reading or writing.\n"
+    "- Knowledge vs web: search the knowledge base first for anything about the user's personal context, projects, or notes. Use web_search when the knowledge base has nothing useful or the topic requires current information.\n"
+    "- Email: use list_emails with filters before fetching full message content.\n"
+    "- Places: when the user asks about nearby places or 'near me', use the current location coordinates from the system prompt if available.\n"
+    "- Available tools: you only receive tools relevant to the current request. "
+    "If you need a capability not shown in your current tools, call `request_tools` "
+    "with the relevant category — don't tell the user you can't do something until you've tried expanding first."
+)
+
+_VOICE_PROMPT = (
+    "## Voice mode\n"
+    "You are responding to a voice interface. Follow these rules strictly:\n"
+    "- Reply in 2-3 natural spoken sentences only. Never more.\n"
+    "- No bullet points, numbered lists, headers, or markdown of any kind.\n"
+    "- Speak conversationally, as if talking to someone in person.\n"
+    "- Give the core answer directly. If a topic needs more depth, cover the key point "
+    "and offer to elaborate if they want.\n"
+    "- Never open with filler words like 'certainly', 'absolutely', or 'of course'.\n"
+    "- After using a tool, summarize the result in plain speech — do not repeat raw data, dates in ISO format, or structured output."
+)
+
+
 async def _build_system_prompt(mode: str = "chat", user_message: str = "", location=None) -> list[dict[str, Any]]:
     memory_section = format_for_prompt(await load_relevant_memory(user_message))
-    location_section = ""
-    if location:
-        location_section = (
-            f"\n\n## User's Current Location\n"
-            f"Lat: {location.latitude}, Lng: {location.longitude}\n"
-            f"Use these coordinates when calling search_places for 'near me' queries."
-        )
     blocks: list[dict[str, Any]] = [
         {
             "type": "text",
-            "text": (
-                "You are Sazed, a personal AI assistant.\n\n"
-                "## Behavior\n"
-                "- Be direct and concise. No preamble, no filler.\n"
-                "- Always use tools to get real data. Never answer from assumption when a tool can verify.\n"
-                "- Match response length to the question — short for simple answers, structured only when it genuinely helps.\n"
-                "- When a tool fails, say so clearly and suggest what to try instead.\n"
-                "- When the user asks you to remember something, call memory_update immediately.\n"
-                "- The user can always see what tools you use, so skip action telegraphing.\n\n"
-                "## Tools\n"
-                "You have tools for: calendar, tasks, email, Google Drive, GitHub, "
-                "Google Sheets, notifications, web search, places, and a personal knowledge base.\n\n"
-                "## Tool guidance\n"
-                "- Tasks: call get_task_lists first to get valid list IDs before creating, reading, or updating tasks.\n"
-                "- Drive files: call list_files to find a file ID before reading, updating, or deleting.\n"
-                "- Sheets: call get_spreadsheet_info first to confirm tab names and structure before reading or writing.\n"
-                "- Knowledge vs web: search the knowledge base first for anything about the user's personal context, projects, or notes. Use web_search when the knowledge base has nothing useful or the topic requires current information.\n"
-                "- Email: use list_emails with filters before fetching full message content.\n"
-                "- Places: when the user asks about nearby places or 'near me', use the current location coordinates from the system prompt if available.\n"
-                "- Available tools: you only receive tools relevant to the current request. "
-                "If you need a capability not shown in your current tools, call `request_tools` "
-                "with the relevant category — don't tell the user you can't do something until you've tried expanding first."
-            ),
+            "text": _BASE_PROMPT,
             "cache_control": {"type": "ephemeral"},
         },
         {
             "type": "text",
-            "text": f"## Known facts about the user\n{memory_section}{location_section}",
+            "text": f"## Known facts about the user\n{memory_section}",
             "cache_control": {"type": "ephemeral"},
         },
     ]
-    if mode == "voice":
+    # Location changes between requests — keep it after the cached blocks so it never
+    # invalidates the memory prefix.
+    if location:
         blocks.append({
             "type": "text",
             "text": (
-                "## Voice mode\n"
-                "You are responding to a voice interface. Follow these rules strictly:\n"
-                "- Reply in 2-3 natural spoken sentences only. Never more.\n"
-                "- No bullet points, numbered lists, headers, or markdown of any kind.\n"
-                "- Speak conversationally, as if talking to someone in person.\n"
-                "- Give the core answer directly. If a topic needs more depth, cover the key point "
-                "and offer to elaborate if they want.\n"
-                "- Never open with filler words like 'certainly', 'absolutely', or 'of course'.\n"
-                "- After using a tool, summarize the result in plain speech — do not repeat raw data, dates in ISO format, or structured output."
+                f"## User's Current Location\n"
+                f"Lat: {location.latitude}, Lng: {location.longitude}\n"
+                f"Use these coordinates when calling search_places for 'near me' queries."
             ),
         })
+    if mode == "voice":
+        blocks.append({"type": "text", "text": _VOICE_PROMPT})
     return blocks
 
 
-def _content_to_dicts(content: list) -> list[dict[str, Any]]:
-    """Convert SDK content blocks to plain dicts for the messages array."""
+_NO_RESPONSE_TEXT = "I wasn't able to complete that."
+
+
+def _split_response(content: list) -> tuple[list[dict[str, Any]], str | None, list]:
+    """Walk SDK content blocks once.
+
+    Returns (content_dicts, first_text, tool_use_blocks): plain dicts for the messages
+    array, the first text block's text (None if there is none), and the raw tool_use blocks.
+    """
     result = []
+    first_text = None
+    tool_blocks = []
     for block in content:
         if block.type == "text":
             result.append({"type": "text", "text": block.text})
+            if first_text is None:
+                first_text = block.text
         elif block.type == "tool_use":
             result.append({
                 "type": "tool_use",
@@ -141,14 +190,8 @@ def _content_to_dicts(content: list) -> list[dict[str, Any]]:
                 "name": block.name,
                 "input": block.input,
             })
-    return result
-
-
-def _extract_text(content: list[dict[str, Any]]) -> str:
-    for block in content:
-        if block.get("type") == "text":
-            return block["text"]
-    return "I wasn't able to complete that."
+            tool_blocks.append(block)
+    return result, first_text, tool_blocks
 
 
 async def _apply_context_window(
@@ -176,7 +219,9 @@ async def _apply_context_window(
             f"  context window: compressing {len(overflow)} overflow messages "
             f"(previously {summarized_through})"
         )
-        summary = await compress_context(overflow, existing_summary)
+        # Only the messages that slid out of the window since the last summary are new to it
+        new_overflow = overflow[summarized_through:] if existing_summary else overflow
+        summary = await compress_context(new_overflow, existing_summary)
         await pool.execute(
             "UPDATE sessions SET context_summary = $1, summarized_through = $2 WHERE id = $3",
             summary, len(overflow), session_id,
@@ -194,12 +239,69 @@ async def _apply_context_window(
     return summary_pair + recent
 
 
-async def _save_message(pool, session_id: uuid.UUID, role: str, content: Any) -> None:
-    """Persist one message row. Content is JSON-encoded to handle both strings and block lists."""
-    await pool.execute(
-        "INSERT INTO messages (session_id, role, content) VALUES ($1, $2, $3)",
-        session_id, role, json.dumps(content),
+# clock_timestamp() rather than the column default: NOW() is fixed for a whole transaction,
+# which would give every row of a batch the same timestamp and lose their order.
+# The session's message_count is bumped in the same statement, so it stays O(1) per insert
+# instead of recounting the session's messages.
+_INSERT_MESSAGE_SQL = """
+    WITH inserted AS (
+        INSERT INTO messages (session_id, role, content, timestamp)
+        VALUES ($1, $2, $3, clock_timestamp())
     )
+    UPDATE sessions SET message_count = message_count + 1 WHERE id = $1
+"""
+
+
+async def _save_messages(conn, session_id: uuid.UUID, messages: list[dict[str, Any]]) -> None:
+    """Persist message rows in one batch.
+
+    Content is JSON-encoded to handle both strings and block lists.
+
+    conn may be a pool or a connection; executemany is atomic either way.
+    """
+    if not messages:
+        return
+    await conn.executemany(
+        _INSERT_MESSAGE_SQL,
+        [(session_id, m["role"], json.dumps(m["content"])) for m in messages],
+    )
+    cached = _history_cache.get(session_id)
+    if cached is not None:
+        cached.extend(messages)
+
+
+# Opens a turn in one round-trip: creates the session if needed, returns its message_count
+# and model, and — only when $2 (the cached history length, -1 if none) is stale — the
+# whole history as one JSON array. The INSERT's row is invisible to the rest of the
+# statement, hence the UNION with the existing row. Returns no row when a concurrent
+# transaction created the session after this statement's snapshot; callers retry once.
+# History is built server-side so the client does a single json.loads instead of one per
+# row. content is stored as JSON text, so ::json re-parses it rather than nesting a string.
+_OPEN_SESSION_SQL = """
+    WITH ins AS (
+        INSERT INTO sessions (id) VALUES ($1) ON CONFLICT DO NOTHING
+        RETURNING message_count, model
+    ),
+    s AS (
+        SELECT message_count, model FROM ins
+        UNION ALL
+        SELECT message_count, model FROM sessions WHERE id = $1
+        LIMIT 1
+    )
+    SELECT
+        s.message_count,
+        s.model,
+        CASE WHEN s.message_count IS DISTINCT FROM $2 THEN (
+            SELECT COALESCE(
+                json_agg(
+                    json_build_object('role', role, 'content', content::json) ORDER BY timestamp
+                ),
+                '[]'
+            )
+            FROM messages WHERE session_id = $1
+        ) END AS history
+    FROM s
+"""
 
 
 async def _setup_turn(
@@ -209,22 +311,31 @@ async def _setup_turn(
     mode: str,
     timezone: str | None,
     location,
-) -> tuple[list, list, list]:
+) -> tuple[list, list, list, str | None]:
     """Load session messages, apply context window, append user message, build system prompt + tools.
 
-    Returns (messages, system, tools).
-    Session INSERT must be done by the caller before calling this.
+    Returns (messages, system, tools, session_model) — session_model is the model the session
+    last escalated to, or None.
+    Creates the session row if it doesn't exist yet. The new user message is the last entry
+    of messages and is not yet persisted — the caller saves it with _save_user_message.
     """
-    rows = await pool.fetch(
-        "SELECT role, content FROM messages WHERE session_id = $1 ORDER BY timestamp",
-        sid,
-    )
-    messages: list[dict[str, Any]] = [
-        {"role": r["role"], "content": json.loads(r["content"])} for r in rows
-    ]
-    logger.debug(f"session {sid}: loaded {len(messages)} prior messages")
+    cached = _history_cache.get(sid)
+    cached_len = len(cached) if cached is not None else -1
+    session = await pool.fetchrow(_OPEN_SESSION_SQL, sid, cached_len)
+    if session is None:
+        # Lost a race with a concurrent first turn: its INSERT committed after this
+        # statement's snapshot was taken, so neither branch of the UNION saw the row.
+        # A fresh statement gets a fresh snapshot and finds it.
+        session = await pool.fetchrow(_OPEN_SESSION_SQL, sid, cached_len)
+    if session["history"] is None:
+        messages: list[dict[str, Any]] = list(cached)
+        logger.debug(f"session {sid}: {len(messages)} prior messages from cache")
+    else:
+        messages = json.loads(session["history"])
+        _history_cache[sid] = list(messages)
+        logger.debug(f"session {sid}: loaded {len(messages)} prior messages")
 
-    if not rows:
+    if not messages:
         asyncio.create_task(_generate_session_title(pool, sid, user_message))
 
     messages = await _apply_context_window(pool, sid, messages)
@@ -237,24 +348,24 @@ async def _setup_turn(
     tz_prefix = f"[{now.strftime('%A, %B %d, %Y')} {now.strftime('%I:%M %p')} {tz.key}]\n"
     prefixed_message = tz_prefix + user_message
     messages.append({"role": "user", "content": prefixed_message})
-    await _save_message(pool, sid, "user", prefixed_message)
-    logger.debug(f"session {sid}: user message='{user_message[:120]}'")
+    logger.debug("session %s: user message='%.120s'", sid, user_message)
 
     system = await _build_system_prompt(mode, user_message, location)
     tools = select_tools(user_message)
-    logger.debug(f"  selected {len(tools)} tools for: '{user_message[:80]}'")
+    logger.debug("  selected %d tools for: '%.80s'", len(tools), user_message)
 
-    return messages, system, tools
+    return messages, system, tools, session["model"]
 
 
-async def _execute_regular_tools(
+async def _record_tool_results(
     pool,
     sid: uuid.UUID,
     regular_blocks: list,
+    raw_results: list,
     tool_call_counts: Counter,
     turn: int,
 ) -> tuple[list[tuple], str | None]:
-    """Execute tool blocks concurrently, detect stuck loops, persist action logs.
+    """Detect stuck loops and persist action logs for one turn's executed tool blocks.
 
     Returns ([(block, tool_result), ...], stuck_msg_or_None).
     On stuck: partial result list (pre-stuck entries only), non-None stuck_msg.
@@ -263,8 +374,6 @@ async def _execute_regular_tools(
     if not regular_blocks:
         return [], None
 
-    raw_results = await asyncio.gather(*[execute_tool(b.name, b.input) for b in regular_blocks])
-
     results = []
     log_coros = []
     stuck_msg = None
@@ -296,17 +405,46 @@ async def _execute_regular_tools(
     return results, stuck_msg
 
 
-async def _finalize_turn(pool, sid: uuid.UUID) -> None:
-    """Update session last_activity and message_count."""
-    await pool.execute(
-        """
-        UPDATE sessions
-        SET last_activity = NOW(),
-            message_count = (SELECT COUNT(*) FROM messages WHERE session_id = $1)
-        WHERE id = $1
-        """,
-        sid,
-    )
+def _save_user_message(pool, sid: uuid.UUID, message: dict[str, Any]) -> asyncio.Task:
+    """Start persisting the turn's user message in the background.
+
+    The insert overlaps the first LLM call instead of delaying it, and as a task it still
+    completes if the turn then fails or the client disconnects. Every later write of the
+    turn awaits it first, so rows keep their order.
+    """
+    return asyncio.create_task(_save_messages(pool, sid, [message]))
+
+
+async def _flush_pending(
+    pool, sid: uuid.UUID, user_saved: asyncio.Task, pending: list[dict[str, Any]]
+) -> None:
+    await user_saved
+    await _save_messages(pool, sid, pending)
+    pending.clear()
+
+
+async def _finalize_turn(
+    pool,
+    sid: uuid.UUID,
+    user_saved: asyncio.Task,
+    pending: list[dict[str, Any]],
+    model: str | None = None,
+) -> None:
+    """Save any unpersisted messages and update session last_activity (and model, if escalated).
+
+    Runs as a single transaction so the closing writes cost one pool checkout.
+    message_count is maintained by the message INSERT itself.
+    """
+    await user_saved
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await _save_messages(conn, sid, pending)
+            await conn.execute(
+                "UPDATE sessions SET last_activity = NOW(), model = COALESCE($2, model) "
+                "WHERE id = $1",
+                sid, model,
+            )
+    pending.clear()
 
 
 async def run_turn(
@@ -322,19 +460,27 @@ async def run_turn(
 
     pool = get_pool()
     sid = uuid.UUID(session_id)
-    await pool.execute("INSERT INTO sessions (id) VALUES ($1) ON CONFLICT DO NOTHING", sid)
-
-    messages, system, tools = await _setup_turn(pool, sid, user_message, mode, timezone, location)
+    messages, system, tools, session_model = await _setup_turn(
+        pool, sid, user_message, mode, timezone, location
+    )
+    user_saved = _save_user_message(pool, sid, messages[-1])
+    # Messages not yet written to the DB. Flushed with each tool turn's results so an
+    # assistant tool_use row is never persisted without its tool_result.
+    pending: list[dict[str, Any]] = []
 
     client = get_client()
-    final_content: list[dict[str, Any]] = []
+    final_text: str | None = None
     tool_call_counts: Counter = Counter()
     force_sonnet = False
     tools_used: list[str] = []
-    user_message_long = len(user_message) >= settings.sonnet_message_len_threshold
+    request_long = _request_long(user_message, messages)
+    # Model recorded on the session at the end of the turn, routing the next request
+    next_model = session_model
 
     for turn in range(settings.agent_max_turns):
-        model, model_reason = _select_model(turn, user_message_long, tools_used, force_sonnet)
+        model, model_reason = _select_model(request_long, force_sonnet, session_model)
+        if model == settings.sonnet_model:
+            next_model = model
         t0 = time.perf_counter()
         logger.debug(f"  turn {turn}: calling {model} ({model_reason}) with {len(messages)} messages in context")
         try:
@@ -342,7 +488,7 @@ async def run_turn(
                 client.messages.create(
                     model=model,
                     system=system,
-                    messages=messages,
+                    messages=mark_cache_breakpoint(messages),
                     tools=tools,
                     max_tokens=4096,
                 ),
@@ -350,7 +496,7 @@ async def run_turn(
             )
         except asyncio.TimeoutError:
             logger.warning(f"  turn {turn}: LLM call timed out after {settings.turn_timeout_seconds}s")
-            await _finalize_turn(pool, sid)
+            await _finalize_turn(pool, sid, user_saved, pending, next_model)
             return session_id, "Request timed out — please try again."
 
         logger.debug(
@@ -358,16 +504,14 @@ async def run_turn(
             f"in {time.perf_counter() - t0:.3f}s"
         )
 
-        content_dicts = _content_to_dicts(response.content)
+        content_dicts, final_text, tool_blocks = _split_response(response.content)
         messages.append({"role": "assistant", "content": content_dicts})
-        await _save_message(pool, sid, "assistant", content_dicts)
-        final_content = content_dicts
+        pending.append(messages[-1])
 
         if response.stop_reason == "end_turn":
             break
 
         if response.stop_reason == "tool_use":
-            tool_blocks = [b for b in response.content if b.type == "tool_use"]
             logger.debug(f"  turn {turn}: tool calls → {[b.name for b in tool_blocks]}")
 
             expand_results: dict[str, str] = {}
@@ -377,7 +521,7 @@ async def run_turn(
                     categories = block.input.get("categories", [])
                     tools, msg = expand_tools(tools, categories)
                     expand_results[block.id] = msg
-                    logger.debug(f"  turn {turn}: request_tools {categories} → {msg[:80]}")
+                    logger.debug("  turn %d: request_tools %s → %.80s", turn, categories, msg)
                 elif block.name == "request_escalation":
                     force_sonnet = True
                     expand_results[block.id] = "Switching to enhanced reasoning mode."
@@ -386,17 +530,24 @@ async def run_turn(
                     regular_blocks.append(block)
 
             tools_used.extend(b.name for b in regular_blocks)
+            if _escalate_next_request(turn, tools_used):
+                next_model = settings.sonnet_model
 
             tool_results: list[dict[str, Any]] = [
                 {"type": "tool_result", "tool_use_id": bid, "content": msg}
                 for bid, msg in expand_results.items()
             ]
-            results, stuck_msg = await _execute_regular_tools(
-                pool, sid, regular_blocks, tool_call_counts, turn
+            raw_results = await asyncio.gather(
+                *schedule_tools([(b.name, b.input) for b in regular_blocks])
+            )
+            results, stuck_msg = await _record_tool_results(
+                pool, sid, regular_blocks, raw_results, tool_call_counts, turn
             )
             if stuck_msg:
-                final_content = [{"type": "text", "text": stuck_msg}]
-                await _save_message(pool, sid, "assistant", final_content)
+                final_text = stuck_msg
+                pending.append(
+                    {"role": "assistant", "content": [{"type": "text", "text": stuck_msg}]}
+                )
                 break
 
             for block, tool_result in results:
@@ -410,48 +561,61 @@ async def run_turn(
                 tool_results.append(tr)
 
             messages.append({"role": "user", "content": tool_results})
-            await _save_message(pool, sid, "user", tool_results)
+            pending.append(messages[-1])
+            await _flush_pending(pool, sid, user_saved, pending)
         else:
             logger.debug(f"  turn {turn}: unexpected stop_reason, bailing out")
             break
 
-    # If the loop exhausted turns mid-tool-use, final_content has no text.
+    # If the loop exhausted turns mid-tool-use, there is no final text.
     # Do one synthesis call (no tools) so the user gets an actual response.
-    if not any(b.get("type") == "text" for b in final_content):
+    if final_text is None:
         logger.debug(f"  synthesis: loop ended on tool_use, upgrading to {settings.sonnet_model}")
         try:
             synth = await asyncio.wait_for(
                 client.messages.create(
                     model=settings.sonnet_model,
                     system=system,
-                    messages=messages,
+                    messages=mark_cache_breakpoint(messages),
                     max_tokens=1024,
                 ),
                 timeout=settings.turn_timeout_seconds,
             )
         except asyncio.TimeoutError:
             logger.warning(f"  synthesis: timed out after {settings.turn_timeout_seconds}s")
-            await _finalize_turn(pool, sid)
+            await _finalize_turn(pool, sid, user_saved, pending, next_model)
             return session_id, "Request timed out during synthesis — please try again."
-        content_dicts = _content_to_dicts(synth.content)
-        await _save_message(pool, sid, "assistant", content_dicts)
-        final_content = content_dicts
+        content_dicts, final_text, _ = _split_response(synth.content)
+        pending.append({"role": "assistant", "content": content_dicts})
 
-    await _finalize_turn(pool, sid)
-    response_text = _extract_text(final_content)
-    logger.debug(f"session {session_id}: final response='{response_text[:120]}'")
+    await _finalize_turn(pool, sid, user_saved, pending, next_model)
+    response_text = final_text if final_text is not None else _NO_RESPONSE_TEXT
+    logger.debug("session %s: final response='%.120s'", session_id, response_text)
     return session_id, response_text
 
 
+# SSE framing — event prefixes are encoded once; each frame is a single bytes concat.
+_SSE_PREFIXES: dict[str, bytes] = {
+    name: f"event: {name}\ndata: ".encode()
+    for name in ("session", "tool_start", "tool_done", "text_delta", "done")
+}
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = _SSE_PREFIXES["done"] + b"{}" + _SSE_SUFFIX
+
+
+def _sse(event: str, data: dict[str, Any]) -> bytes:
+    return _SSE_PREFIXES[event] + json.dumps(data, separators=(",", ":")).encode() + _SSE_SUFFIX
+
+
 async def run_turn_stream(
     session_id: str | None,
     user_message: str,
     mode: str = "chat",
     timezone: str | None = None,
     location=None,
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """
-    Run one user turn through the agent loop, yielding SSE-formatted strings.
+    Run one user turn through the agent loop, yielding encoded SSE frames.
 
     Events yielded:
         event: session    data: {"session_id": "..."}                              — before first LLM call
@@ -465,21 +629,29 @@ async def run_turn_stream(
 
     pool = get_pool()
     sid = uuid.UUID(session_id)
-    await pool.execute("INSERT INTO sessions (id) VALUES ($1) ON CONFLICT DO NOTHING", sid)
-
-    messages, system, tools = await _setup_turn(pool, sid, user_message, mode, timezone, location)
+    messages, system, tools, session_model = await _setup_turn(
+        pool, sid, user_message, mode, timezone, location
+    )
+    user_saved = _save_user_message(pool, sid, messages[-1])
+    # Messages not yet written to the DB. Flushed with each tool turn's results so an
+    # assistant tool_use row is never persisted without its tool_result.
+    pending: list[dict[str, Any]] = []
 
-    yield f"event: session\ndata: {json.dumps({'session_id': session_id})}\n\n"
+    yield _sse("session", {"session_id": session_id})
 
     client = get_client()
     tool_call_counts: Counter = Counter()
     stuck = False
     force_sonnet = False
     tools_used: list[str] = []
-    user_message_long = len(user_message) >= settings.sonnet_message_len_threshold
+    request_long = _request_long(user_message, messages)
+    # Model recorded on the session at the end of the turn, routing the next request
+    next_model = session_model
 
     for turn in range(settings.agent_max_turns):
-        model, model_reason = _select_model(turn, user_message_long, tools_used, force_sonnet)
+        model, model_reason = _select_model(request_long, force_sonnet, session_model)
+        if model == settings.sonnet_model:
+            next_model = model
         t0 = time.perf_counter()
         logger.debug(f"  stream turn {turn}: calling {model} ({model_reason}) with {len(messages)} messages")
 
@@ -488,19 +660,19 @@ async def run_turn_stream(
                 async with client.messages.stream(
                     model=model,
                     system=system,
-                    messages=messages,
+                    messages=mark_cache_breakpoint(messages),
                     tools=tools,
                     max_tokens=4096,
                 ) as stream:
                     async for text in stream.text_stream:
-                        yield f"event: text_delta\ndata: {json.dumps({'text': text})}\n\n"
+                        yield _sse("text_delta", {"text": text})
                     response = await stream.get_final_message()
         except asyncio.TimeoutError:
             logger.warning(f"  stream turn {turn}: timed out after {settings.turn_timeout_seconds}s")
             timeout_msg = "Request timed out — please try again."
-            yield f"event: text_delta\ndata: {json.dumps({'text': timeout_msg})}\n\n"
-            await _finalize_turn(pool, sid)
-            yield f"event: done\ndata: {{}}\n\n"
+            yield _sse("text_delta", {"text": timeout_msg})
+            await _finalize_turn(pool, sid, user_saved, pending, next_model)
+            yield _SSE_DONE
             return
 
         logger.debug(
@@ -508,15 +680,14 @@ async def run_turn_stream(
             f"in {time.perf_counter() - t0:.3f}s"
         )
 
-        content_dicts = _content_to_dicts(response.content)
+        content_dicts, _, tool_blocks = _split_response(response.content)
         messages.append({"role": "assistant", "content": content_dicts})
-        await _save_message(pool, sid, "assistant", content_dicts)
+        pending.append(messages[-1])
 
         if response.stop_reason == "end_turn":
             break
 
         if response.stop_reason == "tool_use":
-            tool_blocks = [b for b in response.content if b.type == "tool_use"]
             logger.debug(f"  stream turn {turn}: tool calls → {[b.name for b in tool_blocks]}")
 
             expand_results: dict[str, str] = {}
@@ -526,7 +697,9 @@ async def run_turn_stream(
                     categories = block.input.get("categories", [])
                     tools, msg = expand_tools(tools, categories)
                     expand_results[block.id] = msg
-                    logger.debug(f"  stream turn {turn}: request_tools {categories} → {msg[:80]}")
+                    logger.debug(
+                        "  stream turn %d: request_tools %s → %.80s", turn, categories, msg
+                    )
                 elif block.name == "request_escalation":
                     force_sonnet = True
                     expand_results[block.id] = "Switching to enhanced reasoning mode."
@@ -535,25 +708,49 @@ async def run_turn_stream(
                     regular_blocks.append(block)
 
             tools_used.extend(b.name for b in regular_blocks)
+            if _escalate_next_request(turn, tools_used):
+                next_model = settings.sonnet_model
 
             for block in regular_blocks:
-                yield f"event: tool_start\ndata: {json.dumps({'name': block.name})}\n\n"
+                yield _sse("tool_start", {"name": block.name})
 
             tool_results: list[dict[str, Any]] = [
                 {"type": "tool_result", "tool_use_id": bid, "content": msg}
                 for bid, msg in expand_results.items()
             ]
-            results, stuck_msg = await _execute_regular_tools(
-                pool, sid, regular_blocks, tool_call_counts, turn
+            # Emit tool_done as each call finishes rather than after the slowest one
+            tasks = schedule_tools([(b.name, b.input) for b in regular_blocks])
+            # A task may serve several identical calls — map each to all of its blocks
+            running: dict[asyncio.Task, list] = {}
+            for task, block in zip(tasks, regular_blocks):
+                running.setdefault(task, []).append(block)
+            try:
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        tool_result = task.result()
+                        for block in running.pop(task):
+                            yield _sse("tool_done", {
+                                "name": block.name,
+                                "status": tool_result.status,
+                                "error": tool_result.error,
+                            })
+            finally:
+                for task in running:
+                    task.cancel()
+
+            results, stuck_msg = await _record_tool_results(
+                pool, sid, regular_blocks, [t.result() for t in tasks], tool_call_counts, turn
             )
             if stuck_msg:
-                await _save_message(pool, sid, "assistant", [{"type": "text", "text": stuck_msg}])
-                yield f"event: text_delta\ndata: {json.dumps({'text': stuck_msg})}\n\n"
+                pending.append(
+                    {"role": "assistant", "content": [{"type": "text", "text": stuck_msg}]}
+                )
+                yield _sse("text_delta", {"text": stuck_msg})
                 stuck = True
                 break
 
             for block, tool_result in results:
-                yield f"event: tool_done\ndata: {json.dumps({'name': block.name, 'status': tool_result.status, 'error': tool_result.error})}\n\n"
                 tr: dict[str, Any] = {
                     "type": "tool_result",
                     "tool_use_id": block.id,
@@ -567,7 +764,8 @@ async def run_turn_stream(
                 break
 
             messages.append({"role": "user", "content": tool_results})
-            await _save_message(pool, sid, "user", tool_results)
+            pending.append(messages[-1])
+            await _flush_pending(pool, sid, user_saved, pending)
         else:
             logger.debug(f"  stream turn {turn}: unexpected stop_reason, bailing")
             break
@@ -583,22 +781,22 @@ async def run_turn_stream(
                 async with client.messages.stream(
                     model=settings.sonnet_model,
                     system=system,
-                    messages=messages,
+                    messages=mark_cache_breakpoint(messages),
                     max_tokens=1024,
                 ) as stream:
                     async for text in stream.text_stream:
-                        yield f"event: text_delta\ndata: {json.dumps({'text': text})}\n\n"
+                        yield _sse("text_delta", {"text": text})
                     synth = await stream.get_final_message()
         except asyncio.TimeoutError:
             logger.warning(f"  stream synthesis: timed out after {settings.turn_timeout_seconds}s")
-            yield f"event: text_delta\ndata: {json.dumps({'text': 'Request timed out during synthesis.'})}\n\n"
+            yield _sse("text_delta", {"text": "Request timed out during synthesis."})
         else:
-            content_dicts = _content_to_dicts(synth.content)
-            await _save_message(pool, sid, "assistant", content_dicts)
+            content_dicts, _, _ = _split_response(synth.content)
+            pending.append({"role": "assistant", "content": content_dicts})
 
-    await _finalize_turn(pool, sid)
+    await _finalize_turn(pool, sid, user_saved, pending, next_model)
     logger.debug(f"stream session {session_id}: done")
-    yield f"event: done\ndata: {{}}\n\n"
+    yield _SSE_DONE
 
 
 async def get_session(session_id: str) -> list[dict[str, Any]] | None:
@@ -622,11 +820,55 @@ async def get_session(session_id: str) -> list[dict[str, Any]] | None:
     ]
 
 
-async def list_sessions() -> list[dict[str, Any]]:
-    """Return all sessions ordered by most recent activity."""
+async def stream_session(session_id: str) -> AsyncIterator[bytes] | None:
+    """Like get_session, but as the encoded JSON response body, produced incrementally.
+
+    Returns None if the session doesn't exist (checked up front, so callers can still 404);
+    otherwise an iterator of chunks of {"session_id", "messages", "message_count"}.
+    """
+    pool = get_pool()
+    sid = uuid.UUID(session_id)
+    if await pool.fetchval("SELECT 1 FROM sessions WHERE id = $1", sid) is None:
+        return None
+    return _session_chunks(pool, session_id, sid)
+
+
+# Timestamps are formatted explicitly as UTC with microseconds, as isoformat() rendered
+# them; json_build_object would follow the server TimeZone and trim trailing zeros.
+_SESSION_MESSAGES_JSON_SQL = """
+    SELECT json_build_object(
+        'role', role,
+        'content', content::json,
+        'timestamp', to_char(timestamp AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"')
+    )::text
+    FROM messages WHERE session_id = $1 ORDER BY timestamp
+"""
+
+
+async def _session_chunks(pool, session_id: str, sid: uuid.UUID) -> AsyncIterator[bytes]:
+    # Rows come off a server-side cursor, so memory stays flat however long the session is.
+    # Postgres renders each message object itself, so every row arrives as finished JSON
+    # text and is joined in without any per-field work in Python.
+    parts = [f'{{"session_id": {json.dumps(session_id)}, "messages": ['.encode()]
+    count = 0
+    async with pool.acquire() as conn, conn.transaction():
+        async for r in conn.cursor(_SESSION_MESSAGES_JSON_SQL, sid):
+            parts.append(f'{"," if count else ""}{r[0]}'.encode())
+            count += 1
+            if len(parts) >= 100:
+                yield b"".join(parts)
+                parts.clear()
+    parts.append(f'], "message_count": {count}}}'.encode())
+    yield b"".join(parts)
+
+
+async def list_sessions(limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
+    """Return sessions ordered by most recent activity; all of them unless limit is given."""
     pool = get_pool()
     rows = await pool.fetch(
-        "SELECT id, message_count, last_activity, created_at, session_type, title FROM sessions ORDER BY last_activity DESC"
+        "SELECT id, message_count, last_activity, created_at, session_type, title FROM sessions "
+        "ORDER BY last_activity DESC LIMIT $1 OFFSET $2",  # LIMIT NULL means no limit
+        limit, offset,
     )
     return [
         {
@@ -3,9 +3,13 @@
 import logging
 import re
 import uuid
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from typing import Any
 
+import cachetools
+
+from app.config import settings
 from app.db import get_pool
 
 logger = logging.getLogger(__name__)
@@ -24,6 +28,13 @@ _MEMORY_PATTERNS: dict[str, re.Pattern] = {
 
 _ALWAYS_MEMORY_CATEGORIES: frozenset[str] = frozenset({"personal", "instruction"})
 
+# Prompt-path cache keyed by category set. Facts change rarely compared to how often the
+# system prompt is built; every write in this module clears it, so only changes made by
+# another process can be up to a TTL stale.
+_RELEVANT_CACHE: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=32, ttl=settings.memory_cache_ttl_seconds
+)
+
 
 async def load_memory() -> list[dict[str, Any]]:
     """Return all facts sorted by most recently updated."""
@@ -36,25 +47,60 @@ async def load_memory() -> list[dict[str, Any]]:
     return [dict(row) for row in rows]
 
 
+async def load_memory_for_prompt() -> list[dict[str, Any]]:
+    """Return all facts with only the columns prompts use (fact_type, key, value)."""
+    pool = get_pool()
+    rows = await pool.fetch(
+        "SELECT fact_type, key, value FROM agent_memory ORDER BY updated_at DESC"
+    )
+    logger.debug(f"load_memory_for_prompt: {len(rows)} fact(s)")
+    return [dict(row) for row in rows]
+
+
 async def load_relevant_memory(user_message: str) -> list[dict[str, Any]]:
     """Load only the fact categories relevant to the current user message.
 
     personal and instruction are always included.
     preference, project, relationship are pattern-matched from the message.
     """
-    categories = set(_ALWAYS_MEMORY_CATEGORIES)
-    for cat, pat in _MEMORY_PATTERNS.items():
-        if pat.search(user_message):
-            categories.add(cat)
+    categories = frozenset(
+        _ALWAYS_MEMORY_CATEGORIES
+        | {cat for cat, pat in _MEMORY_PATTERNS.items() if pat.search(user_message)}
+    )
+    cached = _RELEVANT_CACHE.get(categories)
+    if cached is not None:
+        logger.debug(
+            f"load_relevant_memory: {len(cached)} cached fact(s) from categories {set(categories)}"
+        )
+        return cached
 
     pool = get_pool()
     rows = await pool.fetch(
-        "SELECT id, fact_type, key, value, confidence, source, created_at, updated_at "
+        "SELECT fact_type, key, value "
         "FROM agent_memory WHERE fact_type = ANY($1::text[]) ORDER BY updated_at DESC",
         list(categories),
     )
-    logger.debug(f"load_relevant_memory: {len(rows)} fact(s) from categories {categories}")
-    return [dict(row) for row in rows]
+    logger.debug(f"load_relevant_memory: {len(rows)} fact(s) from categories {set(categories)}")
+    facts = [dict(row) for row in rows]
+    _RELEVANT_CACHE[categories] = facts
+    return facts
+
+
+# Only overwrites an existing fact's value if the new confidence is at least the stored one
+_UPSERT_FACT_SQL = """
+    INSERT INTO agent_memory (fact_type, key, value, confidence, source)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (fact_type, key) DO UPDATE
+        SET value      = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
+                              THEN EXCLUDED.value      ELSE agent_memory.value      END,
+            confidence = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
+                              THEN EXCLUDED.confidence ELSE agent_memory.confidence END,
+            source     = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
+                              THEN EXCLUDED.source     ELSE agent_memory.source     END,
+            updated_at = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
+                              THEN NOW()               ELSE agent_memory.updated_at END
+    RETURNING id, fact_type, key, value, confidence, source, created_at, updated_at
+"""
 
 
 async def upsert_fact(
@@ -70,32 +116,32 @@ async def upsert_fact(
     """
     pool = get_pool()
     logger.debug(f"upsert_fact: [{fact_type}] {key}={value!r} confidence={confidence} source={source}")
-    row = await pool.fetchrow(
-        """
-        INSERT INTO agent_memory (fact_type, key, value, confidence, source)
-        VALUES ($1, $2, $3, $4, $5)
-        ON CONFLICT (fact_type, key) DO UPDATE
-            SET value      = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
-                                  THEN EXCLUDED.value      ELSE agent_memory.value      END,
-                confidence = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
-                                  THEN EXCLUDED.confidence ELSE agent_memory.confidence END,
-                source     = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
-                                  THEN EXCLUDED.source     ELSE agent_memory.source     END,
-                updated_at = CASE WHEN EXCLUDED.confidence >= agent_memory.confidence
-                                  THEN NOW()               ELSE agent_memory.updated_at END
-        RETURNING id, fact_type, key, value, confidence, source, created_at, updated_at
-        """,
-        fact_type, key, value, confidence, source,
-    )
+    row = await pool.fetchrow(_UPSERT_FACT_SQL, fact_type, key, value, confidence, source)
+    _RELEVANT_CACHE.clear()
     return dict(row)
 
 
+async def upsert_facts(facts: list[tuple[str, str, str, float]], source: str) -> int:
+    """Upsert many (fact_type, key, value, confidence) facts in one transaction.
+
+    Same confidence rule as upsert_fact; executemany pipelines the rows so the batch costs
+    one round-trip instead of one per fact. Returns the number of facts written.
+    """
+    pool = get_pool()
+    logger.debug(f"upsert_facts: {len(facts)} fact(s) source={source}")
+    async with pool.acquire() as conn, conn.transaction():
+        await conn.executemany(_UPSERT_FACT_SQL, [(*f, source) for f in facts])
+    _RELEVANT_CACHE.clear()
+    return len(facts)
+
+
 async def delete_fact(memory_id: str) -> bool:
     """Delete a fact by UUID. Returns False if not found."""
     pool = get_pool()
     result = await pool.execute(
         "DELETE FROM agent_memory WHERE id = $1", uuid.UUID(memory_id)
     )
+    _RELEVANT_CACHE.clear()
     return result == "DELETE 1"
 
 
@@ -104,15 +150,12 @@ def format_for_prompt(facts: list[dict[str, Any]]) -> str:
     if not facts:
         return "(None yet)"
 
-    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for fact in facts:
-        grouped[fact["fact_type"]].append(fact)
-
-    lines = []
-    for fact_type, items in grouped.items():
-        lines.append(f"**{fact_type.capitalize()}**")
-        for item in items:
-            lines.append(f"- {item['key']}: {item['value']}")
-        lines.append("")
+    # Stable sort: groups come out alphabetically, facts keep their recency order within a group
+    parts: list[str] = []
+    by_type = itemgetter("fact_type")
+    for fact_type, items in groupby(sorted(facts, key=by_type), key=by_type):
+        parts.append(f"**{fact_type.capitalize()}**\n")
+        parts.extend(f"- {item['key']}: {item['value']}\n" for item in items)
+        parts.append("\n")
 
-    return "\n".join(lines).strip()
+    return "".join(parts).strip()
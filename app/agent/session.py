@@ -1,19 +1,114 @@
 """Session processing pipeline — fact extraction and summarization."""
 
 import asyncio
+import hashlib
 import json
 import logging
+import re
+from collections.abc import AsyncIterator
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from typing import Any
 
-import httpx
+import cachetools
 
 from app.agent.client import get_client
-from app.agent.memory import load_memory, upsert_fact
+from app.agent.memory import load_memory_for_prompt, upsert_fact
 from app.config import settings
+from app.gateway import get_gateway_client
 
 logger = logging.getLogger(__name__)
 
+# Exact-match cache for Haiku prompt completions, keyed by a hash of (model, max_tokens, prompt).
+# Retries and re-processing of an unchanged session skip the API call entirely.
+_COMPLETION_CACHE: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=256, ttl=settings.llm_cache_ttl_seconds
+)
+
+
+# Bounds in-flight background Haiku calls across all sessions being processed, so an archive
+# run can't trigger a 429/backoff storm that also slows interactive chat.
+_HAIKU_SEM = asyncio.Semaphore(settings.haiku_max_concurrency)
+
+
+def _completion_key(prompt: str, max_tokens: int) -> str:
+    return hashlib.blake2b(
+        f"{settings.haiku_model}|{max_tokens}|{prompt}".encode(), digest_size=16
+    ).hexdigest()
+
+
+def _static_len(template: str) -> int:
+    """Length of a format template's leading static text (everything before the first field)."""
+    return template.index("{")
+
+
+def _user_content(prompt: str, static_len: int) -> str | list[dict[str, Any]]:
+    """Split the prompt so its static prefix is a cacheable block of its own.
+
+    Anthropic caches the prefix up to a cache_control breakpoint server-side, so the fixed
+    instructions aren't re-billed at full input price on every session.
+    """
+    if not static_len:
+        return prompt
+    return [
+        {"type": "text", "text": prompt[:static_len], "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": prompt[static_len:]},
+    ]
+
+
+async def _cached_create(
+    prompt: str, max_tokens: int, static_len: int = 0, throttle: bool = True
+) -> str:
+    """Run a single-prompt Haiku completion, reusing the text of an identical earlier call.
+
+    static_len marks how many leading characters of the prompt are fixed instructions.
+    throttle=False skips _HAIKU_SEM, for calls on the interactive turn path.
+    """
+    key = _completion_key(prompt, max_tokens)
+    cached = _COMPLETION_CACHE.get(key)
+    if cached is not None:
+        logger.debug(f"completion cache hit ({len(prompt)} char prompt)")
+        return cached
+
+    async with _HAIKU_SEM if throttle else nullcontext():
+        response = await get_client().messages.create(
+            model=settings.haiku_model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": _user_content(prompt, static_len)}],
+        )
+    text = response.content[0].text
+    _COMPLETION_CACHE[key] = text
+    return text
+
+
+async def _stream_completion(
+    prompt: str, max_tokens: int, static_len: int = 0
+) -> AsyncIterator[str]:
+    """Like _cached_create, but yields text as Haiku decodes it. A cache hit is a single chunk."""
+    key = _completion_key(prompt, max_tokens)
+    cached = _COMPLETION_CACHE.get(key)
+    if cached is not None:
+        logger.debug(f"completion cache hit ({len(prompt)} char prompt)")
+        yield cached
+        return
+
+    parts: list[str] = []
+    async with _HAIKU_SEM, get_client().messages.stream(
+        model=settings.haiku_model,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": _user_content(prompt, static_len)}],
+    ) as stream:
+        async for text in stream.text_stream:
+            parts.append(text)
+            yield text
+    _COMPLETION_CACHE[key] = "".join(parts)
+
+
+_BLOCK_FORMATTERS: dict[str, Any] = {
+    "text": lambda role, block: f"{role}: {block['text']}",
+    "tool_use": lambda role, block: f"{role} [called {block['name']}]",
+}
+
 
 def _format_messages(messages: list[dict[str, Any]]) -> str:
     """
@@ -21,57 +116,139 @@ def _format_messages(messages: list[dict[str, Any]]) -> str:
     Includes user text and assistant text. Briefly notes tool calls.
     Skips raw tool results (too noisy for extraction/summarization).
     """
-    lines = []
+    lines: list[str] = []
+    append = lines.append
     for msg in messages:
         role = msg["role"].upper()
         content = msg["content"]
 
-        if isinstance(content, str):
-            lines.append(f"{role}: {content}")
+        if type(content) is str:
+            append(f"{role}: {content}")
             continue
 
-        if isinstance(content, list):
+        if type(content) is list:
             for block in content:
-                if not isinstance(block, dict):
+                if type(block) is not dict:
                     continue
-                btype = block.get("type")
-                if btype == "text":
-                    lines.append(f"{role}: {block['text']}")
-                elif btype == "tool_use":
-                    lines.append(f"{role} [called {block['name']}]")
-                # tool_result blocks skipped intentionally
+                # tool_result blocks have no handler — skipped intentionally
+                handler = _BLOCK_FORMATTERS.get(block.get("type"))
+                if handler is not None:
+                    append(handler(role, block))
 
     return "\n\n".join(lines)
 
 
+def _bounded_conversation(conversation: str, max_chars: int) -> str:
+    """Trim a formatted conversation to about max_chars by eliding whole middle messages.
+
+    Keeps the opening (what the session was about) and the end (where it landed), cutting
+    on message boundaries so no message is split.
+    """
+    if len(conversation) <= max_chars:
+        return conversation
+    half = max_chars // 2
+    head_end = conversation.rfind("\n\n", 0, half)
+    tail_start = conversation.find("\n\n", len(conversation) - half)
+    if head_end < 0 or tail_start < 0 or tail_start <= head_end:
+        return conversation
+    elided = conversation.count("\n\n", head_end, tail_start)
+    return (
+        f"{conversation[:head_end]}\n\n[... {elided} messages elided ...]"
+        f"{conversation[tail_start:]}"
+    )
+
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+def _select_relevant_facts(
+    facts: list[dict[str, Any]], conversation: str, limit: int
+) -> list[dict[str, Any]]:
+    """Keep the `limit` facts sharing the most words with the conversation.
+
+    The extraction prompt only needs existing facts to reuse keys and avoid duplicates, and
+    those are the facts the conversation touches. Ties keep the incoming (recency) order.
+    Below the limit everything is kept.
+    """
+    if len(facts) <= limit:
+        return facts
+    words = set(_WORD_RE.findall(conversation.lower()))
+
+    def overlap(fact: dict[str, Any]) -> int:
+        text = f"{fact['key'].replace('_', ' ')} {fact['value']}".lower()
+        return len(words.intersection(_WORD_RE.findall(text)))
+
+    return sorted(facts, key=overlap, reverse=True)[:limit]
+
+
 def _format_existing_facts(facts: list[dict[str, Any]]) -> str:
     if not facts:
         return "(none)"
     return "\n".join(f"- [{f['fact_type']}] {f['key']}: {f['value']}" for f in facts)
 
 
-def _parse_json_list(text: str) -> list[dict[str, Any]]:
-    """Parse a JSON array from LLM output, handling markdown code fences."""
-    text = text.strip()
-    if text.startswith("```"):
-        lines = text.splitlines()
-        text = "\n".join(lines[1:-1])
-    try:
-        result = json.loads(text)
-        return result if isinstance(result, list) else []
-    except json.JSONDecodeError:
-        return []
-
+class _JsonArrayScanner:
+    """Incremental scanner over LLM output containing a JSON array of objects.
 
-async def compress_context(
-    overflow_messages: list[dict[str, Any]],
-    existing_summary: str | None,
-) -> str:
-    """Compress overflow messages into a rolling context summary for the session."""
-    conversation = _format_messages(overflow_messages)
+    feed() takes text chunks and returns the objects whose closing brace has arrived, so
+    callers can act on each element while the rest is still decoding. Text before the
+    first '[' (prose, a code fence) and after the closing ']' is ignored; elements that
+    are not valid JSON objects are skipped.
+    """
 
-    if existing_summary:
-        prompt = f"""Update the following conversation summary to incorporate new messages.
+    def __init__(self) -> None:
+        self._depth = 0  # 0: before the array, 1: between elements, 2+: inside an element, -1: done
+        self._in_string = False
+        self._escape = False
+        self._buf: list[str] = []
+
+    @property
+    def closed(self) -> bool:
+        """True once the array's closing bracket has been seen."""
+        return self._depth < 0
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        for ch in chunk:
+            if self._depth < 0:
+                break
+            if self._depth == 0:
+                if ch == "[":
+                    self._depth = 1
+                continue
+            if self._depth >= 2:
+                self._buf.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                if self._depth == 1:
+                    self._buf = [ch]
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 1:
+                    try:
+                        element = json.loads("".join(self._buf))
+                    except json.JSONDecodeError:
+                        element = None
+                    if isinstance(element, dict):
+                        out.append(element)
+                    self._buf = []
+                elif self._depth == 0:
+                    self._depth = -1
+        return out
+
+
+# Prompt templates are built once at import; each call only fills in the dynamic fields
+_COMPRESS_UPDATE_TEMPLATE = """Update the following conversation summary to incorporate new messages.
 
 Existing summary:
 {existing_summary}
@@ -80,31 +257,40 @@ New messages to incorporate:
 {conversation}
 
 Produce a single updated summary covering everything. Be concise — this will be prepended to future messages as background context."""
-    else:
-        prompt = f"""Summarize the following conversation as background context for a personal AI assistant.
+
+_COMPRESS_NEW_TEMPLATE = """Summarize the following conversation as background context for a personal AI assistant.
 Focus on key decisions, important information exchanged, and action items.
 Be concise — this summary will be prepended to future messages to maintain context.
 
 Conversation:
 {conversation}"""
 
-    response = await get_client().messages.create(
-        model=settings.haiku_model,
-        max_tokens=768,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return response.content[0].text.strip()
+_COMPRESS_UPDATE_STATIC_LEN = _static_len(_COMPRESS_UPDATE_TEMPLATE)
+_COMPRESS_NEW_STATIC_LEN = _static_len(_COMPRESS_NEW_TEMPLATE)
 
 
-async def _extract_facts(
-    messages: list[dict[str, Any]],
-    existing_facts: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
-    """Ask Haiku to extract personal facts from the conversation."""
-    conversation = _format_messages(messages)
-    existing = _format_existing_facts(existing_facts)
+async def compress_context(
+    overflow_messages: list[dict[str, Any]],
+    existing_summary: str | None,
+) -> str:
+    """Compress overflow messages into a rolling context summary for the session."""
+    conversation = _format_messages(overflow_messages)
+
+    if existing_summary:
+        prompt = _COMPRESS_UPDATE_TEMPLATE.format_map(
+            {"existing_summary": existing_summary, "conversation": conversation}
+        )
+        static_len = _COMPRESS_UPDATE_STATIC_LEN
+    else:
+        prompt = _COMPRESS_NEW_TEMPLATE.format_map({"conversation": conversation})
+        static_len = _COMPRESS_NEW_STATIC_LEN
+
+    # Runs inside a live /chat or /think turn — don't queue behind background processing
+    text = await _cached_create(prompt, max_tokens=768, static_len=static_len, throttle=False)
+    return text.strip()
 
-    prompt = f"""You are building a persistent memory for a personal AI assistant.
+
+_FACTS_INSTRUCTIONS = """You are building a persistent memory for a personal AI assistant.
 These facts will be injected into every future conversation so the assistant can be more helpful and personalized over time. Extract only facts that are durable and personally meaningful — things that will still be relevant weeks or months from now.
 
 Extract facts in these categories:
@@ -127,76 +313,135 @@ Return a JSON array of objects with these fields:
   value: the fact value, e.g. "Python"
   confidence: 1.0 if explicitly stated, 0.7 if clearly implied
 
-Return [] if no new or updated facts are found.
-Return only the JSON array, no other text.
+Return [] if no new or updated facts are found."""
+
+_SUMMARY_INSTRUCTIONS = """Summarize this conversation in 1-3 paragraphs.
+Focus on: key topics discussed, decisions made, action items, and important information shared.
+Be concise and factual."""
+
+_KB_INSTRUCTIONS = """Generate a structured knowledge base entry for this conversation session.
+Include only sections that have meaningful content:
+
+**Topics:** comma-separated list of main topics discussed
+**Summary:** 2-4 sentences covering what was discussed
+**Actions:** bullet list of things Sazed actually did (files read, searches run, tool calls made, data fetched)
+**Decisions:** bullet list of concrete decisions or conclusions reached
+**Follow-ups:** bullet list of action items or things to revisit
+**Entities:** comma-separated list of files, projects, people, or tools specifically referenced
 
-Existing facts:
+Be specific and factual. Include enough detail that this entry is useful without the full conversation."""
+
+# The instruction blocks contain no braces, so they can be embedded in format templates as-is
+# Dynamic tail shared by the extraction prompts
+_FACTS_CONTEXT_TEMPLATE = """Existing facts:
 {existing}
 
 Conversation:
 {conversation}"""
 
-    response = await get_client().messages.create(
-        model=settings.haiku_model,
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return _parse_json_list(response.content[0].text)
+_EXTRACT_TEMPLATE = _FACTS_INSTRUCTIONS + """
+Return only the JSON array, no other text.
 
+""" + _FACTS_CONTEXT_TEMPLATE
 
-async def _summarize(messages: list[dict[str, Any]]) -> str:
-    """Ask Haiku to summarize the session."""
-    conversation = _format_messages(messages)
+_SUMMARIZE_TEMPLATE = _SUMMARY_INSTRUCTIONS + """
 
-    prompt = f"""Summarize this conversation in 1-3 paragraphs.
-Focus on: key topics discussed, decisions made, action items, and important information shared.
-Be concise and factual.
+Conversation:
+{conversation}"""
+
+_KB_TEMPLATE = _KB_INSTRUCTIONS + """
 
 Conversation:
 {conversation}"""
 
-    response = await get_client().messages.create(
-        model=settings.haiku_model,
-        max_tokens=512,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return response.content[0].text.strip()
+# Formatted per combination of tasks; stays identical across sessions, so it is cached too
+_FUSED_HEAD_TEMPLATE = """Complete each of the following tasks for the conversation below.
 
+{task_text}
 
-async def _generate_kb_summary(
-    messages: list[dict[str, Any]],
-    session_dt: datetime,
-    message_count: int | None = None,
-    session_start: datetime | None = None,
-) -> str:
-    """Generate a rich, structured KB summary for Drive ingestion."""
-    conversation = _format_messages(messages)
-    count = message_count if message_count is not None else len(messages)
+Return only a single JSON object, no other text, with these keys:
+{key_text}
 
-    prompt = f"""Generate a structured knowledge base entry for this conversation session.
-Include only sections that have meaningful content:
+"""
 
-**Topics:** comma-separated list of main topics discussed
-**Summary:** 2-4 sentences covering what was discussed
-**Actions:** bullet list of things Sazed actually did (files read, searches run, tool calls made, data fetched)
-**Decisions:** bullet list of concrete decisions or conclusions reached
-**Follow-ups:** bullet list of action items or things to revisit
-**Entities:** comma-separated list of files, projects, people, or tools specifically referenced
+_EXTRACT_STATIC_LEN = _static_len(_EXTRACT_TEMPLATE)
+_SUMMARIZE_STATIC_LEN = _static_len(_SUMMARIZE_TEMPLATE)
+_KB_STATIC_LEN = _static_len(_KB_TEMPLATE)
 
-Be specific and factual. Include enough detail that this entry is useful without the full conversation.
+# Output budgets of the individual calls; the fused call gets the sum of the parts it asks for
+_FACTS_MAX_TOKENS = 1024
+_SUMMARY_MAX_TOKENS = 512
+_KB_MAX_TOKENS = 768
 
-Conversation:
-{conversation}"""
 
-    response = await get_client().messages.create(
-        model=settings.haiku_model,
-        max_tokens=768,
-        messages=[{"role": "user", "content": prompt}],
+# Caps concurrent fact upserts so a large extraction can't take every pool connection
+_UPSERT_SEM = asyncio.Semaphore(settings.memory_upsert_concurrency)
+
+
+async def _safe_upsert(fact: dict[str, Any], session_id: str) -> dict[str, Any] | None:
+    """Upsert one extracted fact (only overwrites if confidence >= existing). None if malformed."""
+    try:
+        fact_type, key, value = fact["fact_type"], fact["key"], fact["value"]
+        confidence = float(fact.get("confidence", 0.7))
+    except (KeyError, ValueError):
+        return None
+    async with _UPSERT_SEM:
+        return await upsert_fact(
+            fact_type=fact_type,
+            key=key,
+            value=value,
+            confidence=confidence,
+            source=session_id,
+        )
+
+
+async def _extract_facts(
+    conversation: str,
+    existing_facts: list[dict[str, Any]],
+    session_id: str,
+) -> list[dict[str, Any]]:
+    """Ask Haiku to extract personal facts from the conversation and upsert them.
+
+    The reply is streamed; each fact is upserted as soon as its object closes, overlapping
+    the DB writes with the rest of the decode. Returns the upserted rows.
+    """
+    existing = _format_existing_facts(existing_facts)
+
+    prompt = _EXTRACT_TEMPLATE.format_map({"existing": existing, "conversation": conversation})
+
+    scanner = _JsonArrayScanner()
+    tasks: list[asyncio.Task] = []
+    try:
+        async for chunk in _stream_completion(
+            prompt, max_tokens=_FACTS_MAX_TOKENS, static_len=_EXTRACT_STATIC_LEN
+        ):
+            for fact in scanner.feed(chunk):
+                tasks.append(asyncio.create_task(_safe_upsert(fact, session_id)))
+    finally:
+        rows = await asyncio.gather(*tasks)
+    return [row for row in rows if row is not None]
+
+
+async def _summarize(conversation: str) -> str:
+    """Ask Haiku to summarize the session."""
+    conversation = _bounded_conversation(conversation, settings.summary_max_chars)
+    prompt = _SUMMARIZE_TEMPLATE.format_map({"conversation": conversation})
+    text = await _cached_create(
+        prompt, max_tokens=_SUMMARY_MAX_TOKENS, static_len=_SUMMARIZE_STATIC_LEN
     )
-    body = response.content[0].text.strip()
+    return text.strip()
+
+
+def _format_kb_entry(
+    body: str,
+    session_dt: datetime,
+    message_count: int,
+    session_start: datetime | None = None,
+) -> str:
+    """Wrap a generated KB entry body with the session date and size/duration header."""
     date_str = session_dt.strftime("%B %d, %Y at %I:%M %p UTC")
 
-    meta_parts = [f"{count} messages"]
+    meta_parts = [f"{message_count} messages"]
     if session_start:
         duration_mins = int((session_dt - session_start).total_seconds() / 60)
         if duration_mins < 60:
@@ -209,6 +454,119 @@ Conversation:
     return f"# Session — {date_str}\n*{meta}*\n\n{body}"
 
 
+async def _generate_kb_summary(
+    conversation: str,
+    session_dt: datetime,
+    message_count: int,
+    session_start: datetime | None = None,
+) -> str:
+    """Generate a rich, structured KB summary for Drive ingestion."""
+    conversation = _bounded_conversation(conversation, settings.summary_max_chars)
+
+    prompt = _KB_TEMPLATE.format_map({"conversation": conversation})
+    body = (
+        await _cached_create(prompt, max_tokens=_KB_MAX_TOKENS, static_len=_KB_STATIC_LEN)
+    ).strip()
+    return _format_kb_entry(body, session_dt, message_count, session_start)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_json_object(text: str) -> dict[str, Any] | None:
+    """Parse a JSON object from LLM output. None on failure.
+
+    Decodes in place from the first '{', so a surrounding code fence or stray prose costs
+    no extra copies and no re-splitting of the text.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    try:
+        result, _ = _JSON_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def _fused_prompt(
+    conversation: str,
+    existing_facts: list[dict[str, Any]],
+    want_summary: bool,
+    want_kb: bool,
+) -> tuple[str, int, int]:
+    """Build the fused facts + summaries prompt. Returns (prompt, static_len, max_tokens)."""
+    existing = _format_existing_facts(existing_facts)
+
+    tasks = [f"## Task: facts\n{_FACTS_INSTRUCTIONS}"]
+    keys = ['  "facts": the JSON array of fact objects from the facts task ([] if none)']
+    max_tokens = _FACTS_MAX_TOKENS
+    if want_summary:
+        tasks.append(f"## Task: summary\n{_SUMMARY_INSTRUCTIONS}")
+        keys.append('  "summary": the summary as a string')
+        max_tokens += _SUMMARY_MAX_TOKENS
+    if want_kb:
+        tasks.append(f"## Task: kb_summary\n{_KB_INSTRUCTIONS}")
+        keys.append('  "kb_summary": the knowledge base entry as a markdown string')
+        max_tokens += _KB_MAX_TOKENS
+
+    head = _FUSED_HEAD_TEMPLATE.format_map(
+        {"task_text": "\n\n".join(tasks), "key_text": "\n".join(keys)}
+    )
+    prompt = head + _FACTS_CONTEXT_TEMPLATE.format_map(
+        {"existing": existing, "conversation": conversation}
+    )
+
+    return prompt, len(head), max_tokens
+
+
+def _parse_fused_reply(text: str, want_summary: bool, want_kb: bool) -> dict[str, Any]:
+    """Recover whichever of {"facts", "summary", "kb_summary"} a fused reply contains.
+
+    kb_summary is the raw entry body, without the session header. If the reply is truncated
+    or malformed, complete fact objects are still salvaged.
+    """
+    parsed = _parse_json_object(text) or {}
+
+    result: dict[str, Any] = {}
+    if isinstance(parsed.get("facts"), list):
+        result["facts"] = parsed["facts"]
+    else:
+        at = text.find('"facts"')
+        if at >= 0:
+            scanner = _JsonArrayScanner()
+            salvaged = scanner.feed(text[at:])
+            # An unclosed array with nothing salvaged can't be told apart from a failure
+            if salvaged or scanner.closed:
+                logger.info(
+                    f"_parse_fused_reply: salvaged {len(salvaged)} fact(s) from malformed reply"
+                )
+                result["facts"] = salvaged
+    if want_summary and isinstance(parsed.get("summary"), str):
+        result["summary"] = parsed["summary"]
+    if want_kb and isinstance(parsed.get("kb_summary"), str):
+        result["kb_summary"] = parsed["kb_summary"]
+    return result
+
+
+async def _extract_and_summarize(
+    conversation: str,
+    existing_facts: list[dict[str, Any]],
+    want_summary: bool,
+    want_kb: bool,
+) -> dict[str, Any]:
+    """Run fact extraction and the requested summaries as one Haiku call.
+
+    The conversation is sent once instead of once per task. Returns whatever
+    _parse_fused_reply recovers; the caller re-runs any missing part as an individual call.
+    """
+    prompt, static_len, max_tokens = _fused_prompt(
+        conversation, existing_facts, want_summary, want_kb
+    )
+    text = await _cached_create(prompt, max_tokens=max_tokens, static_len=static_len)
+    return _parse_fused_reply(text, want_summary, want_kb)
+
+
 async def _ingest_session_to_kb(summary: str, session_dt: datetime) -> tuple[bool, str]:
     """Write session summary to Drive and trigger KB sync. Returns (success, error_message)."""
     if not settings.conversations_folder_id:
@@ -220,38 +578,47 @@ async def _ingest_session_to_kb(summary: str, session_dt: datetime) -> tuple[boo
     base = settings.gateway_url.rstrip("/")
     headers = {"X-API-Key": settings.gateway_api_key} if settings.gateway_api_key else {}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        write_resp = await client.post(
-            f"{base}/storage/files",
-            json={
-                "name": filename,
-                "content": summary,
-                "folder_id": settings.conversations_folder_id,
-                "mime_type": "text/plain",
-            },
-            headers=headers,
-        )
-        if not write_resp.is_success:
-            msg = f"Drive upload failed ({write_resp.status_code}): {write_resp.text}"
-            logger.error(f"Failed to write session summary to Drive: {msg}")
-            return False, msg
-
-        logger.debug(f"Session summary written to Drive: {filename}")
+    write_resp = await get_gateway_client().post(
+        f"{base}/storage/files",
+        json={
+            "name": filename,
+            "content": summary,
+            "folder_id": settings.conversations_folder_id,
+            "mime_type": "text/plain",
+        },
+        headers=headers,
+    )
+    if not write_resp.is_success:
+        msg = f"Drive upload failed ({write_resp.status_code}): {write_resp.text}"
+        logger.error(f"Failed to write session summary to Drive: {msg}")
+        return False, msg
 
-        sync_resp = await client.post(f"{base}/kb/sync", headers=headers)
-        if not sync_resp.is_success:
-            logger.warning(f"KB sync trigger failed after session ingestion: {sync_resp.status_code}")
-        else:
-            logger.debug("KB sync triggered after session ingestion")
+    logger.debug(f"Session summary written to Drive: {filename}")
 
+    # The sync only ever logs its outcome — don't hold the caller for it
+    asyncio.create_task(_trigger_kb_sync(base, headers))
     return True, ""
 
 
+async def _trigger_kb_sync(base: str, headers: dict[str, str]) -> None:
+    """Fire-and-forget: ask the gateway to re-sync the KB after a new session file lands."""
+    try:
+        sync_resp = await get_gateway_client().post(f"{base}/kb/sync", headers=headers)
+    except Exception as e:
+        logger.warning(f"KB sync trigger failed after session ingestion: {e}")
+        return
+    if not sync_resp.is_success:
+        logger.warning(f"KB sync trigger failed after session ingestion: {sync_resp.status_code}")
+    else:
+        logger.debug("KB sync triggered after session ingestion")
+
+
 async def process_session(
     session_id: str,
     messages: list[dict[str, Any]],
     session_dt: datetime | None = None,
     session_start: datetime | None = None,
+    precomputed: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """
     Run fact extraction, summarization, and KB ingestion in parallel where enabled.
@@ -259,6 +626,7 @@ async def process_session(
     When kb_ingest_enabled, writes a structured session summary to Drive and triggers KB sync.
     session_dt: last_activity timestamp used for the Drive filename; defaults to now if not provided.
     session_start: created_at timestamp used to compute session duration; omitted if unavailable.
+    precomputed: an already parsed fused reply (see process_sessions_bulk); replaces the fused call.
     """
     if not messages:
         return {"session_id": session_id, "facts_extracted": 0, "summary": ""}
@@ -266,48 +634,89 @@ async def process_session(
     session_dt = session_dt or datetime.now(timezone.utc)
     message_count = len(messages)
     logger.debug(f"process_session {session_id}: {message_count} messages to process")
-    existing_facts = await load_memory()
+    # Formatted once and shared by every prompt below, fused or individual
+    conversation = _format_messages(messages)
 
-    # Build coroutine map so all active tasks run in parallel
-    coros: dict[str, Any] = {"facts": _extract_facts(messages, existing_facts)}
-    if settings.session_summarization:
-        coros["summary"] = _summarize(messages)
-    if settings.conversations_folder_id:
-        coros["kb_summary"] = _generate_kb_summary(
-            messages, session_dt, message_count=message_count, session_start=session_start
+    async def _load_existing_facts() -> list[dict[str, Any]]:
+        facts = await load_memory_for_prompt()
+        return _select_relevant_facts(facts, conversation, settings.extraction_fact_limit)
+
+    # Only fact extraction needs existing facts — load them while the rest gets going,
+    # unless a precomputed reply already carries the facts
+    needs_memory = precomputed is None or "facts" not in precomputed
+    memory_task = asyncio.create_task(_load_existing_facts()) if needs_memory else None
+    want_summary = settings.session_summarization
+    want_kb = bool(settings.conversations_folder_id)
+
+    fused = precomputed is not None or settings.session_fused_processing
+    results: dict[str, Any] = {}
+    upserted: list[dict[str, Any]] | None = None
+    if precomputed is not None:
+        results = dict(precomputed)
+    elif fused:
+        results = await _extract_and_summarize(
+            conversation, await memory_task, want_summary, want_kb
         )
+    if fused:
+        if "kb_summary" in results:
+            results["kb_summary"] = _format_kb_entry(
+                results["kb_summary"].strip(), session_dt, message_count, session_start
+            )
 
-    results = dict(zip(coros.keys(), await asyncio.gather(*coros.values())))
-
-    raw_facts = results["facts"]
-    summary = results.get("summary", "")
-    kb_summary = results.get("kb_summary", "")
-
-    logger.debug(
-        f"process_session {session_id}: extracted {len(raw_facts)} raw fact(s), "
-        f"summarization={'on' if settings.session_summarization else 'off'}"
+    async def _facts() -> list[dict[str, Any]]:
+        # Facts are upserted by _extract_facts itself as they stream in
+        return await _extract_facts(conversation, await memory_task, session_id)
+
+    # Individual calls for whatever the fused call didn't produce (everything when it's off).
+    # Run in parallel — summaries don't wait on memory.
+    coros: dict[str, Any] = {}
+    if "facts" not in results:
+        coros["facts"] = _facts()
+    if want_summary and "summary" not in results:
+        coros["summary"] = _summarize(conversation)
+    if want_kb and "kb_summary" not in results:
+        coros["kb_summary"] = _generate_kb_summary(
+            conversation, session_dt, message_count, session_start=session_start
+        )
+    if coros:
+        if fused:
+            logger.warning(
+                f"process_session {session_id}: fused reply incomplete, "
+                f"running {list(coros)} separately"
+            )
+        # TaskGroup: a failed call cancels its siblings instead of leaving them running.
+        # Re-raise the first failure itself so callers see the real error, not the group.
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = {key: tg.create_task(coro) for key, coro in coros.items()}
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0] from None
+        results.update((key, task.result()) for key, task in tasks.items())
+        if "facts" in coros:
+            upserted = results["facts"]
+
+    summary = results.get("summary", "").strip() if want_summary else ""
+    kb_summary = results.get("kb_summary", "") if want_kb else ""
+
+    # Drive upload and fact upserts hit independent backends — run them side by side
+    kb_task = (
+        asyncio.create_task(_ingest_session_to_kb(kb_summary, session_dt)) if kb_summary else None
     )
 
-    # Upsert extracted facts — only overwrites if confidence >= existing
-    upserted = []
-    for fact in raw_facts:
-        try:
-            result = await upsert_fact(
-                fact_type=fact["fact_type"],
-                key=fact["key"],
-                value=fact["value"],
-                confidence=float(fact.get("confidence", 0.7)),
-                source=session_id,
-            )
-            upserted.append(result)
-        except (KeyError, ValueError):
-            continue
+    if upserted is None:
+        raw_facts = results["facts"]
+        logger.debug(
+            f"process_session {session_id}: extracted {len(raw_facts)} raw fact(s), "
+            f"summarization={'on' if settings.session_summarization else 'off'}"
+        )
+        rows = await asyncio.gather(*(_safe_upsert(fact, session_id) for fact in raw_facts))
+        upserted = [row for row in rows if row is not None]
 
     kb_ok = False
     kb_error = ""
-    if kb_summary:
+    if kb_task is not None:
         try:
-            kb_ok, kb_error = await _ingest_session_to_kb(kb_summary, session_dt)
+            kb_ok, kb_error = await kb_task
         except Exception as e:
             kb_error = str(e)
             logger.error(f"KB ingestion failed for session {session_id}: {e}")
@@ -319,3 +728,108 @@ async def process_session(
         "kb_ingested": kb_ok,
         "kb_error": kb_error,
     }
+
+
+async def _run_batch(requests: list[dict[str, Any]]) -> dict[str, str]:
+    """Submit requests as one Message Batch and wait for it. Returns {custom_id: reply text}.
+
+    Polls with exponential backoff; a batch still running at session_batch_timeout_seconds
+    is cancelled and whatever had not finished is simply missing from the result.
+    """
+    client = get_client()
+    batch = await client.messages.batches.create(requests=requests)
+    logger.info(f"message batch {batch.id}: submitted {len(requests)} request(s)")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.session_batch_timeout_seconds
+    delay = 2.0
+    while batch.processing_status != "ended":
+        if loop.time() >= deadline:
+            logger.warning(f"message batch {batch.id}: timed out, cancelling")
+            await client.messages.batches.cancel(batch.id)
+            return {}
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 60.0)
+        batch = await client.messages.batches.retrieve(batch.id)
+
+    replies: dict[str, str] = {}
+    async for entry in await client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            replies[entry.custom_id] = entry.result.message.content[0].text
+        else:
+            logger.warning(f"message batch {batch.id}: {entry.custom_id} {entry.result.type}")
+    logger.info(f"message batch {batch.id}: {len(replies)}/{len(requests)} succeeded")
+    return replies
+
+
+async def process_sessions_bulk(
+    sessions: list[tuple[str, list[dict[str, Any]], datetime | None, datetime | None]],
+) -> list[dict[str, Any]]:
+    """
+    Process many completed sessions, sending their Haiku work through the Message Batches API.
+    sessions: (session_id, messages, session_dt, session_start) per session.
+    Each session's fused prompt goes into one batch (half the price of online calls and outside
+    the online rate limit); the replies are then finished by process_session, which re-runs any
+    part a reply lacks as an online call. A session whose batch entry failed is processed fully
+    online. Returns one process_session result per session, in order; a session that raised
+    gets facts_extracted=0 and the error in kb_error.
+    """
+    want_summary = settings.session_summarization
+    want_kb = bool(settings.conversations_folder_id)
+    memory = await load_memory_for_prompt()
+
+    requests: list[dict[str, Any]] = []
+    replies: dict[str, str] = {}
+    keys: dict[str, str] = {}
+    for i, (_, messages, _, _) in enumerate(sessions):
+        if not messages:
+            continue
+        conversation = _format_messages(messages)
+        existing = _select_relevant_facts(memory, conversation, settings.extraction_fact_limit)
+        prompt, static_len, max_tokens = _fused_prompt(
+            conversation, existing, want_summary, want_kb
+        )
+        custom_id = str(i)
+        keys[custom_id] = _completion_key(prompt, max_tokens)
+        cached = _COMPLETION_CACHE.get(keys[custom_id])
+        if cached is not None:
+            replies[custom_id] = cached
+            continue
+        requests.append({
+            "custom_id": custom_id,
+            "params": {
+                "model": settings.haiku_model,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": _user_content(prompt, static_len)}],
+            },
+        })
+
+    if requests:
+        try:
+            batched = await _run_batch(requests)
+        except Exception as e:
+            logger.error(f"message batch failed, processing {len(requests)} session(s) online: {e}")
+            batched = {}
+        for custom_id, text in batched.items():
+            _COMPLETION_CACHE[keys[custom_id]] = text
+        replies.update(batched)
+
+    results: list[dict[str, Any]] = []
+    for i, (session_id, messages, session_dt, session_start) in enumerate(sessions):
+        text = replies.get(str(i))
+        precomputed = _parse_fused_reply(text, want_summary, want_kb) if text is not None else None
+        try:
+            results.append(await process_session(
+                session_id, messages, session_dt=session_dt, session_start=session_start,
+                precomputed=precomputed,
+            ))
+        except Exception as e:
+            logger.error(f"process_session failed for session {session_id}: {e}")
+            results.append({
+                "session_id": session_id,
+                "facts_extracted": 0,
+                "summary": "",
+                "kb_ingested": False,
+                "kb_error": str(e),
+            })
+    return results
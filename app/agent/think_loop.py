@@ -10,10 +10,10 @@ from datetime import datetime
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from app.agent.client import get_client, tool_sig as _tool_sig
-from app.agent.memory import format_for_prompt, load_memory
+from app.agent.client import get_client, mark_cache_breakpoint, tool_sig as _tool_sig
+from app.agent.memory import format_for_prompt, load_memory_for_prompt
 from app.agent.session import compress_context
-from app.agent.tools import execute_tool, get_think_tool_schemas
+from app.agent.tools import get_think_tool_schemas, schedule_tools
 from app.config import settings
 from app.db import get_pool
 
@@ -48,45 +48,49 @@ _CONTEXT_DESCRIPTIONS = {
     ),
 }
 
+_DEFAULT_CONTEXT_DESCRIPTION = (
+    "Run a general proactive check — calendar, tasks, emails, and any other context "
+    "relevant to my current goals and projects."
+)
+
+_THINK_INSTRUCTIONS = (
+    "You are Sazed, running in autonomous think mode. No user is present.\n\n"
+    "## Your job\n"
+    "Check context, notice anything worth acting on, then act — or stay silent.\n\n"
+    "## What to do\n"
+    "1. Pull relevant context (calendar, tasks, emails, KB, GitHub, finance as needed).\n"
+    "2. Cross-reference with what you know about the user's goals, projects, and preferences.\n"
+    "3. Decide what (if anything) to do:\n"
+    "   - Something time-sensitive or important to surface → send_notification "
+    "(max 1 per session, plain text, ≤2 sentences, no greeting or sign-off)\n"
+    "   - A specific upcoming thing to remind the user of → create_task with a due datetime "
+    "in an appropriate list (a 'Reminders' list if one exists, otherwise create it)\n"
+    "   - A durable fact worth preserving → memory_update\n"
+    "   - A longer observation worth keeping → append_to_file on "
+    "'Sazed Think Log.md' in Drive (find it with list_files, or create it), then sync_kb\n"
+    "4. If nothing is genuinely worth doing, do nothing. "
+    "Silence is the correct answer most of the time.\n\n"
+    "## Rules\n"
+    "- Max 1 notification per think session. Make it count.\n"
+    "- Check this session's message history — do not repeat what you already surfaced.\n"
+    "- Notifications: plain text only, no markdown, no greetings, no filler.\n"
+    "- Be selective. A think session that does nothing is better than one that spams."
+)
+
 
 def _build_think_system_prompt(
     context: str | None,
     trigger: str | None,
     memory_section: str,
 ) -> list[dict[str, Any]]:
-    context_desc = _CONTEXT_DESCRIPTIONS.get(context or "", (
-        "Run a general proactive check — calendar, tasks, emails, and any other context "
-        "relevant to my current goals and projects."
-    ))
+    context_desc = _CONTEXT_DESCRIPTIONS.get(context or "", _DEFAULT_CONTEXT_DESCRIPTION)
     if trigger:
         context_desc += f"\n\nThis think was triggered by: {trigger}"
 
     blocks: list[dict[str, Any]] = [
         {
             "type": "text",
-            "text": (
-                "You are Sazed, running in autonomous think mode. No user is present.\n\n"
-                "## Your job\n"
-                "Check context, notice anything worth acting on, then act — or stay silent.\n\n"
-                "## What to do\n"
-                "1. Pull relevant context (calendar, tasks, emails, KB, GitHub, finance as needed).\n"
-                "2. Cross-reference with what you know about the user's goals, projects, and preferences.\n"
-                "3. Decide what (if anything) to do:\n"
-                "   - Something time-sensitive or important to surface → send_notification "
-                "(max 1 per session, plain text, ≤2 sentences, no greeting or sign-off)\n"
-                "   - A specific upcoming thing to remind the user of → create_task with a due datetime "
-                "in an appropriate list (a 'Reminders' list if one exists, otherwise create it)\n"
-                "   - A durable fact worth preserving → memory_update\n"
-                "   - A longer observation worth keeping → append_to_file on "
-                "'Sazed Think Log.md' in Drive (find it with list_files, or create it), then sync_kb\n"
-                "4. If nothing is genuinely worth doing, do nothing. "
-                "Silence is the correct answer most of the time.\n\n"
-                "## Rules\n"
-                "- Max 1 notification per think session. Make it count.\n"
-                "- Check this session's message history — do not repeat what you already surfaced.\n"
-                "- Notifications: plain text only, no markdown, no greetings, no filler.\n"
-                "- Be selective. A think session that does nothing is better than one that spams."
-            ),
+            "text": _THINK_INSTRUCTIONS,
             "cache_control": {"type": "ephemeral"},
         },
         {
@@ -119,7 +123,9 @@ async def _apply_context_window(
     summarized_through = row["summarized_through"] if row else 0
 
     if len(overflow) > summarized_through:
-        summary = await compress_context(overflow, existing_summary)
+        # Only the messages that slid out of the window since the last summary are new to it
+        new_overflow = overflow[summarized_through:] if existing_summary else overflow
+        summary = await compress_context(new_overflow, existing_summary)
         await pool.execute(
             "UPDATE sessions SET context_summary = $1, summarized_through = $2 WHERE id = $3",
             summary, len(overflow), session_id,
@@ -137,11 +143,30 @@ async def _apply_context_window(
     return summary_pair + recent
 
 
-async def _save_message(pool, session_id: uuid.UUID, role: str, content: Any) -> None:
-    await pool.execute(
-        "INSERT INTO messages (session_id, role, content) VALUES ($1, $2, $3)",
-        session_id, role, json.dumps(content),
+# Hot-path statements as module constants: asyncpg prepares each distinct query string
+# once per connection and reuses the plan from its statement cache.
+_INSERT_MESSAGE_SQL = """
+    WITH inserted AS (
+        INSERT INTO messages (session_id, role, content) VALUES ($1, $2, $3)
     )
+    UPDATE sessions SET message_count = message_count + 1 WHERE id = $1
+"""
+
+# Creates the think session if needed and returns its history in the same round-trip
+_OPEN_SESSION_SQL = """
+    WITH ins AS (
+        INSERT INTO sessions (id, session_type) VALUES ($1, 'think') ON CONFLICT DO NOTHING
+    )
+    SELECT COALESCE(
+        json_agg(json_build_object('role', role, 'content', content::json) ORDER BY timestamp),
+        '[]'
+    )
+    FROM messages WHERE session_id = $1
+"""
+
+
+async def _save_message(pool, session_id: uuid.UUID, role: str, content: Any) -> None:
+    await pool.execute(_INSERT_MESSAGE_SQL, session_id, role, json.dumps(content))
 
 
 def _content_to_dicts(content: list) -> list[dict[str, Any]]:
@@ -182,18 +207,7 @@ async def run_think(
     pool = get_pool()
     sid = uuid.UUID(session_id)
 
-    await pool.execute(
-        "INSERT INTO sessions (id, session_type) VALUES ($1, 'think') ON CONFLICT DO NOTHING",
-        sid,
-    )
-
-    rows = await pool.fetch(
-        "SELECT role, content FROM messages WHERE session_id = $1 ORDER BY timestamp",
-        sid,
-    )
-    messages: list[dict[str, Any]] = [
-        {"role": r["role"], "content": json.loads(r["content"])} for r in rows
-    ]
+    messages: list[dict[str, Any]] = json.loads(await pool.fetchval(_OPEN_SESSION_SQL, sid))
 
     messages = await _apply_context_window(pool, sid, messages)
 
@@ -211,7 +225,7 @@ async def run_think(
 
     logger.debug(f"think session {session_id}: starting, context={context}")
 
-    memory_section = format_for_prompt(await load_memory())
+    memory_section = format_for_prompt(await load_memory_for_prompt())
     system = _build_think_system_prompt(context, trigger, memory_section)
     tools = get_think_tool_schemas()
     client = get_client()
@@ -227,7 +241,7 @@ async def run_think(
         response = await client.messages.create(
             model=settings.haiku_model,
             system=system,
-            messages=messages,
+            messages=mark_cache_breakpoint(messages),
             tools=tools,
             max_tokens=2048,
         )
@@ -248,7 +262,9 @@ async def run_think(
             tool_blocks = [b for b in response.content if b.type == "tool_use"]
             logger.debug(f"  think turn {turn}: tool calls → {[b.name for b in tool_blocks]}")
 
-            raw_results = await asyncio.gather(*[execute_tool(b.name, b.input) for b in tool_blocks])
+            raw_results = await asyncio.gather(
+                *schedule_tools([(b.name, b.input) for b in tool_blocks])
+            )
 
             tool_results = []
             log_coros = []
@@ -292,20 +308,12 @@ async def run_think(
         else:
             break
 
-    await pool.execute(
-        """
-        UPDATE sessions
-        SET last_activity = NOW(),
-            message_count = (SELECT COUNT(*) FROM messages WHERE session_id = $1)
-        WHERE id = $1
-        """,
-        sid,
-    )
+    await pool.execute("UPDATE sessions SET last_activity = NOW() WHERE id = $1", sid)
 
     acted = bool(write_tools_called)
     summary = _extract_text(final_content)
     logger.debug(
-        f"think session {session_id}: done, acted={acted}, "
-        f"write_tools={write_tools_called}, summary='{summary[:120]}'"
+        "think session %s: done, acted=%s, write_tools=%s, summary='%.120s'",
+        session_id, acted, write_tools_called, summary,
     )
     return session_id, acted, summary
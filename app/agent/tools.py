@@ -1,5 +1,8 @@
 """Tool registry — Anthropic tool schemas and executor for all gateway endpoints."""
 
+import asyncio
+import functools
+import hashlib
 import ipaddress
 import json
 import re
@@ -11,8 +14,10 @@ from urllib.parse import quote, urlparse
 import cachetools
 import httpx
 
+from app.agent.client import tool_sig
 from app.agent.memory import upsert_fact
 from app.config import settings
+from app.gateway import get_gateway_client
 
 
 @dataclass
@@ -45,14 +50,29 @@ _CACHEABLE_TOOLS: frozenset[str] = frozenset({
 })
 
 
-@dataclass
+# Property schemas shared by many tools — one dict each instead of a copy per tool
+_REPO_OWNER = {"type": "string", "description": "Repo owner."}
+_REPO_NAME = {"type": "string", "description": "Repository name."}
+_TASK_LIST_ID = {"type": "string", "description": "The task list ID."}
+_DRIVE_FILE_ID = {"type": "string", "description": "The Drive file ID."}
+
+
+@dataclass(slots=True, frozen=True)
 class ToolDef:
     name: str
     description: str
     input_schema: dict
     method: str                     # GET | POST | PATCH | DELETE | INTERNAL
     endpoint: str                   # gateway path, e.g. "/calendar/events/{event_id}"
-    path_params: list[str] = field(default_factory=list)
+    path_params: tuple[str, ...] = ()
+    query_names: tuple[str, ...] = field(init=False, repr=False, compare=False)  # GET params
+
+    def __post_init__(self) -> None:
+        # Derived from the schema once, not per call
+        props = self.input_schema.get("properties", {})
+        object.__setattr__(
+            self, "query_names", tuple(k for k in props if k not in self.path_params)
+        )
 
 
 TOOLS: list[ToolDef] = [
@@ -162,7 +182,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PATCH",
         endpoint="/calendar/events/{event_id}",
-        path_params=["event_id"],
+        path_params=("event_id",),
     ),
     ToolDef(
         name="delete_event",
@@ -176,7 +196,7 @@ TOOLS: list[ToolDef] = [
         },
         method="DELETE",
         endpoint="/calendar/events/{event_id}",
-        path_params=["event_id"],
+        path_params=("event_id",),
     ),
 
     ToolDef(
@@ -229,7 +249,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/tasks/lists/{list_id}/tasks",
-        path_params=["list_id"],
+        path_params=("list_id",),
     ),
     ToolDef(
         name="create_task_list",
@@ -266,7 +286,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PATCH",
         endpoint="/tasks/lists/{list_id}",
-        path_params=["list_id"],
+        path_params=("list_id",),
     ),
     ToolDef(
         name="create_task",
@@ -291,7 +311,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/tasks/lists/{list_id}/tasks",
-        path_params=["list_id"],
+        path_params=("list_id",),
     ),
     ToolDef(
         name="update_task",
@@ -299,7 +319,7 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "list_id": {"type": "string", "description": "The task list ID."},
+                "list_id": _TASK_LIST_ID,
                 "task_id": {"type": "string", "description": "The task ID."},
                 "title": {"type": "string"},
                 "notes": {"type": "string"},
@@ -314,7 +334,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PATCH",
         endpoint="/tasks/lists/{list_id}/tasks/{task_id}",
-        path_params=["list_id", "task_id"],
+        path_params=("list_id", "task_id"),
     ),
     ToolDef(
         name="delete_task",
@@ -322,14 +342,14 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "list_id": {"type": "string", "description": "The task list ID."},
+                "list_id": _TASK_LIST_ID,
                 "task_id": {"type": "string", "description": "The task ID."},
             },
             "required": ["list_id", "task_id"],
         },
         method="DELETE",
         endpoint="/tasks/lists/{list_id}/tasks/{task_id}",
-        path_params=["list_id", "task_id"],
+        path_params=("list_id", "task_id"),
     ),
 
     # -------------------------------------------------------------------------
@@ -387,7 +407,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/email/messages/{message_id}",
-        path_params=["message_id"],
+        path_params=("message_id",),
     ),
     ToolDef(
         name="draft_email",
@@ -511,7 +531,7 @@ TOOLS: list[ToolDef] = [
         },
         method="DELETE",
         endpoint="/kb/files/{source_id}",
-        path_params=["source_id"],
+        path_params=("source_id",),
     ),
     ToolDef(
         name="sync_kb",
@@ -683,16 +703,13 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "file_id": {
-                    "type": "string",
-                    "description": "The Drive file ID.",
-                },
+                "file_id": _DRIVE_FILE_ID,
             },
             "required": ["file_id"],
         },
         method="GET",
         endpoint="/storage/files/{file_id}",
-        path_params=["file_id"],
+        path_params=("file_id",),
     ),
     ToolDef(
         name="read_file",
@@ -700,16 +717,13 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "file_id": {
-                    "type": "string",
-                    "description": "The Drive file ID.",
-                },
+                "file_id": _DRIVE_FILE_ID,
             },
             "required": ["file_id"],
         },
         method="GET",
         endpoint="/storage/files/{file_id}/content",
-        path_params=["file_id"],
+        path_params=("file_id",),
     ),
     ToolDef(
         name="create_file",
@@ -745,10 +759,7 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "file_id": {
-                    "type": "string",
-                    "description": "The Drive file ID.",
-                },
+                "file_id": _DRIVE_FILE_ID,
                 "content": {
                     "type": "string",
                     "description": "New file content. Replaces existing content entirely.",
@@ -758,7 +769,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PUT",
         endpoint="/storage/files/{file_id}",
-        path_params=["file_id"],
+        path_params=("file_id",),
     ),
     ToolDef(
         name="append_to_file",
@@ -766,10 +777,7 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "file_id": {
-                    "type": "string",
-                    "description": "The Drive file ID.",
-                },
+                "file_id": _DRIVE_FILE_ID,
                 "content": {
                     "type": "string",
                     "description": "Text to append.",
@@ -783,7 +791,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/storage/files/{file_id}/append",
-        path_params=["file_id"],
+        path_params=("file_id",),
     ),
     ToolDef(
         name="delete_file",
@@ -791,16 +799,13 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "file_id": {
-                    "type": "string",
-                    "description": "The Drive file ID.",
-                },
+                "file_id": _DRIVE_FILE_ID,
             },
             "required": ["file_id"],
         },
         method="DELETE",
         endpoint="/storage/files/{file_id}",
-        path_params=["file_id"],
+        path_params=("file_id",),
     ),
     ToolDef(
         name="move_file",
@@ -808,10 +813,7 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "file_id": {
-                    "type": "string",
-                    "description": "The Drive file ID.",
-                },
+                "file_id": _DRIVE_FILE_ID,
                 "name": {
                     "type": "string",
                     "description": "New file name. Omit to keep the current name.",
@@ -825,7 +827,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PATCH",
         endpoint="/storage/files/{file_id}",
-        path_params=["file_id"],
+        path_params=("file_id",),
     ),
     ToolDef(
         name="copy_file",
@@ -850,7 +852,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/storage/files/{file_id}/copy",
-        path_params=["file_id"],
+        path_params=("file_id",),
     ),
     ToolDef(
         name="copy_file_from_github",
@@ -923,13 +925,13 @@ TOOLS: list[ToolDef] = [
             "type": "object",
             "properties": {
                 "owner": {"type": "string", "description": "Repo owner. Defaults to tharpep for personal repos."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "repo": _REPO_NAME,
             },
             "required": ["owner", "repo"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="list_issues",
@@ -938,7 +940,7 @@ TOOLS: list[ToolDef] = [
             "type": "object",
             "properties": {
                 "owner": {"type": "string", "description": "Repo owner. Use 'tharpep' for personal repos."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "repo": _REPO_NAME,
                 "state": {
                     "type": "string",
                     "enum": ["open", "closed", "all"],
@@ -951,7 +953,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/issues",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="get_issue",
@@ -959,15 +961,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "number": {"type": "integer", "description": "Issue number."},
             },
             "required": ["owner", "repo", "number"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/issues/{number}",
-        path_params=["owner", "repo", "number"],
+        path_params=("owner", "repo", "number"),
     ),
     ToolDef(
         name="create_issue",
@@ -975,8 +977,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "title": {"type": "string", "description": "Issue title."},
                 "body": {"type": "string", "description": "Issue body (Markdown supported)."},
                 "labels": {
@@ -989,7 +991,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/github/repos/{owner}/{repo}/issues",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="update_issue",
@@ -997,8 +999,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "number": {"type": "integer", "description": "Issue number."},
                 "title": {"type": "string"},
                 "body": {"type": "string"},
@@ -1017,7 +1019,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PATCH",
         endpoint="/github/repos/{owner}/{repo}/issues/{number}",
-        path_params=["owner", "repo", "number"],
+        path_params=("owner", "repo", "number"),
     ),
     ToolDef(
         name="add_issue_comment",
@@ -1025,8 +1027,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "number": {"type": "integer", "description": "Issue number."},
                 "body": {"type": "string", "description": "Comment text (Markdown supported)."},
             },
@@ -1034,7 +1036,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/github/repos/{owner}/{repo}/issues/{number}/comments",
-        path_params=["owner", "repo", "number"],
+        path_params=("owner", "repo", "number"),
     ),
     ToolDef(
         name="list_prs",
@@ -1042,8 +1044,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "state": {
                     "type": "string",
                     "enum": ["open", "closed", "all"],
@@ -1055,7 +1057,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/pulls",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="get_pr",
@@ -1063,15 +1065,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "number": {"type": "integer", "description": "PR number."},
             },
             "required": ["owner", "repo", "number"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/pulls/{number}",
-        path_params=["owner", "repo", "number"],
+        path_params=("owner", "repo", "number"),
     ),
     ToolDef(
         name="add_pr_comment",
@@ -1079,8 +1081,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "number": {"type": "integer", "description": "PR number."},
                 "body": {"type": "string", "description": "Comment text (Markdown supported)."},
             },
@@ -1088,7 +1090,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/github/repos/{owner}/{repo}/pulls/{number}/comments",
-        path_params=["owner", "repo", "number"],
+        path_params=("owner", "repo", "number"),
     ),
     ToolDef(
         name="create_pr",
@@ -1096,8 +1098,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "title": {"type": "string", "description": "PR title."},
                 "head": {"type": "string", "description": "Source branch name."},
                 "base": {"type": "string", "description": "Target branch name, e.g. 'main'."},
@@ -1108,7 +1110,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/github/repos/{owner}/{repo}/pulls",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="search_issues",
@@ -1130,8 +1132,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "path": {"type": "string", "description": "File or directory path, e.g. 'src/main.py' or 'src/'."},
                 "ref": {"type": "string", "description": "Branch, tag, or commit SHA. Defaults to the default branch."},
             },
@@ -1139,7 +1141,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/contents/{path}",
-        path_params=["owner", "repo", "path"],
+        path_params=("owner", "repo", "path"),
     ),
     ToolDef(
         name="search_code",
@@ -1162,7 +1164,7 @@ TOOLS: list[ToolDef] = [
             "type": "object",
             "properties": {
                 "owner": {"type": "string", "description": "Repo owner (GitHub username or org)."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "repo": _REPO_NAME,
                 "sha": {"type": "string", "description": "Branch, tag, or commit SHA to start listing from."},
                 "author": {"type": "string", "description": "Filter by GitHub username or email address."},
                 "path": {"type": "string", "description": "Only return commits that touched this file path."},
@@ -1174,7 +1176,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/commits",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="get_commit",
@@ -1182,15 +1184,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "sha": {"type": "string", "description": "Full or short commit SHA."},
             },
             "required": ["owner", "repo", "sha"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/commits/{sha}",
-        path_params=["owner", "repo", "sha"],
+        path_params=("owner", "repo", "sha"),
     ),
     ToolDef(
         name="list_branches",
@@ -1198,15 +1200,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "per_page": {"type": "integer", "description": "Max branches to return (1–100). Defaults to 30."},
             },
             "required": ["owner", "repo"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/branches",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="list_tags",
@@ -1214,15 +1216,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "per_page": {"type": "integer", "description": "Max tags to return (1–100). Defaults to 30."},
             },
             "required": ["owner", "repo"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/tags",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="list_releases",
@@ -1230,15 +1232,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "per_page": {"type": "integer", "description": "Max releases to return (1–100). Defaults to 10."},
             },
             "required": ["owner", "repo"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/releases",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="get_latest_release",
@@ -1246,14 +1248,14 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
             },
             "required": ["owner", "repo"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/releases/latest",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="get_pr_reviews",
@@ -1261,15 +1263,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "number": {"type": "integer", "description": "Pull request number."},
             },
             "required": ["owner", "repo", "number"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/pulls/{number}/reviews",
-        path_params=["owner", "repo", "number"],
+        path_params=("owner", "repo", "number"),
     ),
     ToolDef(
         name="get_pr_files",
@@ -1277,15 +1279,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "number": {"type": "integer", "description": "Pull request number."},
             },
             "required": ["owner", "repo", "number"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/pulls/{number}/files",
-        path_params=["owner", "repo", "number"],
+        path_params=("owner", "repo", "number"),
     ),
     ToolDef(
         name="list_contributors",
@@ -1293,15 +1295,15 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "per_page": {"type": "integer", "description": "Max contributors to return (1–100). Defaults to 20."},
             },
             "required": ["owner", "repo"],
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/contributors",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
     ToolDef(
         name="compare_refs",
@@ -1309,8 +1311,8 @@ TOOLS: list[ToolDef] = [
         input_schema={
             "type": "object",
             "properties": {
-                "owner": {"type": "string", "description": "Repo owner."},
-                "repo": {"type": "string", "description": "Repository name."},
+                "owner": _REPO_OWNER,
+                "repo": _REPO_NAME,
                 "base": {"type": "string", "description": "Base ref (branch, tag, or SHA) to compare from."},
                 "head": {"type": "string", "description": "Head ref to compare against base."},
             },
@@ -1318,7 +1320,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/github/repos/{owner}/{repo}/compare",
-        path_params=["owner", "repo"],
+        path_params=("owner", "repo"),
     ),
 
     # -------------------------------------------------------------------------
@@ -1359,7 +1361,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/sheets/{spreadsheet_id}",
-        path_params=["spreadsheet_id"],
+        path_params=("spreadsheet_id",),
     ),
     ToolDef(
         name="read_sheet",
@@ -1384,7 +1386,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/sheets/{spreadsheet_id}/values/{range}",
-        path_params=["spreadsheet_id", "range"],
+        path_params=("spreadsheet_id", "range"),
     ),
     ToolDef(
         name="write_sheet",
@@ -1425,7 +1427,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PUT",
         endpoint="/sheets/{spreadsheet_id}/values/{range}",
-        path_params=["spreadsheet_id", "range"],
+        path_params=("spreadsheet_id", "range"),
     ),
     ToolDef(
         name="append_sheet_rows",
@@ -1464,7 +1466,7 @@ TOOLS: list[ToolDef] = [
         },
         method="POST",
         endpoint="/sheets/{spreadsheet_id}/values/{range}/append",
-        path_params=["spreadsheet_id", "range"],
+        path_params=("spreadsheet_id", "range"),
     ),
     ToolDef(
         name="clear_sheet_range",
@@ -1485,7 +1487,7 @@ TOOLS: list[ToolDef] = [
         },
         method="DELETE",
         endpoint="/sheets/{spreadsheet_id}/values/{range}",
-        path_params=["spreadsheet_id", "range"],
+        path_params=("spreadsheet_id", "range"),
     ),
 
     # -------------------------------------------------------------------------
@@ -1569,7 +1571,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PATCH",
         endpoint="/finance/subscriptions/{subscription_id}",
-        path_params=["subscription_id"],
+        path_params=("subscription_id",),
     ),
     ToolDef(
         name="delete_subscription",
@@ -1583,7 +1585,7 @@ TOOLS: list[ToolDef] = [
         },
         method="DELETE",
         endpoint="/finance/subscriptions/{subscription_id}",
-        path_params=["subscription_id"],
+        path_params=("subscription_id",),
     ),
     ToolDef(
         name="get_budget",
@@ -1605,7 +1607,7 @@ TOOLS: list[ToolDef] = [
         },
         method="PUT",
         endpoint="/finance/budget/{category}",
-        path_params=["category"],
+        path_params=("category",),
     ),
     ToolDef(
         name="delete_budget",
@@ -1619,7 +1621,7 @@ TOOLS: list[ToolDef] = [
         },
         method="DELETE",
         endpoint="/finance/budget/{category}",
-        path_params=["category"],
+        path_params=("category",),
     ),
     ToolDef(
         name="get_income",
@@ -1659,7 +1661,7 @@ TOOLS: list[ToolDef] = [
         },
         method="DELETE",
         endpoint="/finance/income/{income_id}",
-        path_params=["income_id"],
+        path_params=("income_id",),
     ),
     ToolDef(
         name="get_upcoming_bills",
@@ -1742,7 +1744,7 @@ TOOLS: list[ToolDef] = [
         },
         method="GET",
         endpoint="/places/{place_id}",
-        path_params=["place_id"],
+        path_params=("place_id",),
     ),
     # ── Model escalation ─────────────────────────────────────────────────────
     ToolDef(
@@ -1814,17 +1816,22 @@ _tool_index: dict[str, ToolDef] = {t.name: t for t in TOOLS}
 
 
 def get_tool_schemas() -> list[dict]:
-    """Return tool schemas in the format expected by the Anthropic messages API."""
-    schemas = [
-        {
-            "name": t.name,
-            "description": t.description,
-            "input_schema": t.input_schema,
-        }
-        for t in TOOLS
-    ]
-    schemas[-1]["cache_control"] = {"type": "ephemeral"}
-    return schemas
+    """Return tool schemas in the format expected by the Anthropic messages API.
+
+    Built once and shared (see _schemas_for_names) — copy before mutating.
+    """
+    return list(_schemas_for_names(frozenset(_tool_index)))
+
+
+@functools.cache
+def tool_schema_fingerprint() -> str:
+    """Short hash of the full serialized tool list.
+
+    Anthropic's prompt cache keys on the exact bytes of `tools`, so a changed fingerprint
+    between deploys means every cached prefix starts cold. Logged at startup.
+    """
+    payload = json.dumps(get_tool_schemas(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
 
 
 # ---------------------------------------------------------------------------
@@ -1895,14 +1902,25 @@ THINK_TOOLS: frozenset[str] = frozenset({
 
 def get_think_tool_schemas() -> list[dict]:
     """Return the fixed tool schema list for think mode."""
+    return list(_schemas_for_names(THINK_TOOLS))
+
+
+@functools.lru_cache(maxsize=64)
+def _schemas_for_names(names: frozenset[str]) -> tuple[dict, ...]:
+    """Build (once per distinct name set) the schema list for the given tools.
+
+    Preserves original TOOLS ordering. cache_control applied to last schema.
+    The returned dicts are shared between calls — callers must copy before mutating
+    (expand_tools does).
+    """
     schemas = [
         {"name": t.name, "description": t.description, "input_schema": t.input_schema}
         for t in TOOLS
-        if t.name in THINK_TOOLS
+        if t.name in names
     ]
     if schemas:
         schemas[-1]["cache_control"] = {"type": "ephemeral"}
-    return schemas
+    return tuple(schemas)
 
 
 _CATEGORY_PATTERNS: dict[str, re.Pattern] = {
@@ -1984,14 +2002,7 @@ def select_tools(user_message: str) -> list[dict]:
     for cat in categories:
         selected_names.update(TOOL_CATEGORIES.get(cat, []))
 
-    schemas = [
-        {"name": t.name, "description": t.description, "input_schema": t.input_schema}
-        for t in TOOLS
-        if t.name in selected_names
-    ]
-    if schemas:
-        schemas[-1]["cache_control"] = {"type": "ephemeral"}
-    return schemas
+    return list(_schemas_for_names(frozenset(selected_names)))
 
 
 def expand_tools(current_tools: list[dict], categories: list[str]) -> tuple[list[dict], str]:
@@ -2027,27 +2038,58 @@ def expand_tools(current_tools: list[dict], categories: list[str]) -> tuple[list
     return expanded, msg
 
 
-_SSRF_BLOCKED_HOSTS = {"localhost", "metadata.google.internal"}
+_SSRF_BLOCKED_HOSTS: frozenset[str] = frozenset(
+    {"localhost", "metadata", "metadata.google.internal"}
+)
+
+# Cloud metadata endpoints, listed explicitly, plus ranges the ipaddress flags below miss
+# (Alibaba's metadata service sits in 100.64.0.0/10 shared address space, which isn't "private")
+_SSRF_BLOCKED_NETS = tuple(ipaddress.ip_network(n) for n in (
+    "169.254.169.254/32",   # AWS, GCP, Azure, OCI
+    "100.100.100.200/32",   # Alibaba Cloud
+    "fd00:ec2::254/128",    # AWS IPv6
+    "100.64.0.0/10",        # carrier-grade NAT / shared address space
+))
+
+# Plain http(s)://host[:port] prefix — one C-level match for the common case. Anything with
+# userinfo, IPv6 brackets, backslashes or whitespace in the authority falls back to urlparse.
+_URL_RE = re.compile(r"(https?)://([^/?#@\[\]\\:\s]*)(?::\d*)?(?=[/?#]|$)", re.IGNORECASE)
 
 
 def _check_ssrf(url: str) -> str | None:
     """Return an error string if the URL targets an internal/private resource, else None."""
-    try:
-        parsed = urlparse(url)
-    except Exception:
-        return "Invalid URL."
+    m = _URL_RE.match(url)
+    if m:
+        host = m.group(2).lower()
+    else:
+        # Most rejected inputs are other schemes (file:, data:, javascript:) — refuse them unparsed
+        if not url[:8].lower().startswith(("http://", "https://")):
+            return "Only http and https URLs are allowed."
+        try:
+            parsed = urlparse(url)
+        except Exception:
+            return "Invalid URL."
+
+        if parsed.scheme not in ("http", "https"):
+            return "Only http and https URLs are allowed."
 
-    if parsed.scheme not in ("http", "https"):
-        return "Only http and https URLs are allowed."
+        host = (parsed.hostname or "").lower()
 
-    host = (parsed.hostname or "").lower()
+    return _classify_host(host)
 
+
+@functools.lru_cache(maxsize=1024)
+def _classify_host(host: str) -> str | None:
+    """SSRF verdict for a lowercased host — cached, since the same few hosts recur."""
     if host in _SSRF_BLOCKED_HOSTS:
         return f"Blocked: '{host}' is not an allowed host."
 
     try:
         addr = ipaddress.ip_address(host)
-        if any([addr.is_private, addr.is_loopback, addr.is_link_local, addr.is_reserved]):
+        if (
+            addr.is_loopback or addr.is_private or addr.is_link_local or addr.is_reserved
+            or any(addr in net for net in _SSRF_BLOCKED_NETS)
+        ):
             return "Blocked: private and internal IP addresses are not allowed."
     except ValueError:
         pass  # Hostname, not a literal IP — allowed
@@ -2055,8 +2097,40 @@ def _check_ssrf(url: str) -> str | None:
     return None
 
 
+# Same for every tool call — built once rather than per request
+_GATEWAY_HEADERS: dict[str, str] = {"X-API-Key": settings.gateway_api_key}
+
+# Args left after path interpolation go in the JSON body for these methods, in the query
+# string for GET, and nowhere for DELETE
+_BODY_METHODS: frozenset[str] = frozenset({"POST", "PATCH", "PUT"})
+_VALID_METHODS: frozenset[str] = _BODY_METHODS | {"GET", "DELETE"}
+
+
+# Read calls currently in flight, so identical concurrent calls share one gateway request
+_INFLIGHT: dict[tuple, asyncio.Task] = {}
+
+
 async def execute_tool(name: str, args: dict[str, Any]) -> ToolResult:
-    """Dispatch a tool call and return a ToolResult for the LLM and audit log."""
+    """Dispatch a tool call and return a ToolResult for the LLM and audit log.
+
+    Identical cacheable calls that overlap (across turns or sessions) are coalesced onto
+    the first one's request; once it lands, the result cache serves the rest.
+    """
+    if name not in _CACHEABLE_TOOLS:
+        return await _execute_tool(name, args)
+
+    key = tool_sig(name, args)
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = _INFLIGHT[key] = asyncio.create_task(_execute_tool(name, args, key))
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # Shielded: a cancelled caller mustn't cancel the request other callers are waiting on
+    return await asyncio.shield(task)
+
+
+async def _execute_tool(
+    name: str, args: dict[str, Any], cache_key: tuple | None = None
+) -> ToolResult:
     t0 = time.perf_counter()
 
     def _ms() -> int:
@@ -2068,17 +2142,19 @@ async def execute_tool(name: str, args: dict[str, Any]) -> ToolResult:
     def _ok(content: str) -> ToolResult:
         return ToolResult(content=content, status="success", error=None, duration_ms=_ms())
 
-    tool = _tool_index.get(name)
-    if tool is None:
+    try:
+        tool = _tool_index[name]
+    except KeyError:
         return _err(f"Unknown tool: {name}")
 
     if tool.method == "INTERNAL":
         return await _execute_internal(name, args, t0)
 
-    # Cache lookup — read-only tools only
-    cache_key = None
-    if name in _CACHEABLE_TOOLS:
-        cache_key = (name, tuple(sorted((k, str(v)) for k, v in args.items())))
+    if tool.method not in _VALID_METHODS:
+        return _err(f"Unsupported method: {tool.method}")
+
+    # Cache lookup — read-only tools only (cache_key is only passed for those)
+    if cache_key is not None:
         cached = _TOOL_CACHE.get(cache_key)
         if cached is not None:
             return ToolResult(
@@ -2086,59 +2162,118 @@ async def execute_tool(name: str, args: dict[str, Any]) -> ToolResult:
                 error=cached.error, duration_ms=0,
             )
 
-    # SSRF guard — validate any URL argument before forwarding to the gateway
+    # SSRF guard — validate any URL argument before forwarding to the gateway. Keyed on the
+    # args, not the schema: body methods forward undeclared keys too.
     if "url" in args:
         ssrf_err = _check_ssrf(str(args["url"]))
         if ssrf_err:
             return _err(ssrf_err)
 
-    # Interpolate path params, keeping remaining args for query/body
+    # Interpolate path params in one format pass, keeping remaining args for query/body.
+    # args is never mutated, so tools without path params send it as-is.
     endpoint = tool.endpoint
-    remaining = dict(args)
-    for param in tool.path_params:
-        val = remaining.pop(param, None)
-        if val is None:
-            return _err(f"Missing required path parameter: {param}")
-        endpoint = endpoint.replace(f"{{{param}}}", quote(str(val), safe=""))
+    remaining = args
+    if tool.path_params:
+        path_values: dict[str, str] = {}
+        for param in tool.path_params:
+            val = args.get(param)
+            if val is None:
+                return _err(f"Missing required path parameter: {param}")
+            path_values[param] = quote(str(val), safe="")
+        endpoint = endpoint.format_map(path_values)
+        remaining = {k: v for k, v in args.items() if k not in path_values}
 
     url = f"{settings.gateway_url}{endpoint}"
-    headers = {"X-API-Key": settings.gateway_api_key}
+    if tool.method in _BODY_METHODS:
+        kwargs: dict[str, Any] = {"json": remaining}
+    elif tool.method == "GET":
+        # Only declared params, so the loop is over the schema, not whatever the model sent
+        kwargs = {"params": {k: args[k] for k in tool.query_names if args.get(k) is not None}}
+    else:
+        kwargs = {}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if tool.method == "GET":
-                params = {k: v for k, v in remaining.items() if v is not None}
-                resp = await client.get(url, params=params, headers=headers)
-            elif tool.method == "POST":
-                resp = await client.post(url, json=remaining, headers=headers)
-            elif tool.method == "PATCH":
-                resp = await client.patch(url, json=remaining, headers=headers)
-            elif tool.method == "PUT":
-                resp = await client.put(url, json=remaining, headers=headers)
-            elif tool.method == "DELETE":
-                resp = await client.delete(url, headers=headers)
-                if resp.status_code == 204:
-                    return _ok("Deleted successfully.")
-            else:
-                return _err(f"Unsupported method: {tool.method}")
+        resp = await get_gateway_client().request(
+            tool.method, url, headers=_GATEWAY_HEADERS, **kwargs
+        )
     except httpx.TimeoutException:
         return _err("Request timed out.")
     except httpx.RequestError as e:
         return _err(f"Request error: {e}")
 
+    if tool.method == "DELETE" and resp.status_code == 204:
+        return _ok("Deleted successfully.")
     if not resp.is_success:
         return _err(f"Error {resp.status_code}: {resp.text}")
 
-    try:
-        result = _ok(json.dumps(resp.json()))
-    except Exception:
-        result = _ok(resp.text)
+    # The body goes to the model as-is — parsing and re-dumping JSON added nothing it can read
+    result = _ok(resp.text)
 
     if cache_key:
         _TOOL_CACHE[cache_key] = result
     return result
 
 
+# ---------------------------------------------------------------------------
+# Turn scheduling — reads overlap, writes run one at a time in emitted order
+# ---------------------------------------------------------------------------
+
+# POST endpoints that only read (search APIs that take a request body)
+_READ_ONLY_POST_TOOLS: frozenset[str] = frozenset({"aggregate_search", "search_places"})
+
+
+def is_read_only(name: str) -> bool:
+    """True if the tool has no side effects and may run concurrently with other calls."""
+    tool = _tool_index.get(name)
+    if tool is None:
+        return True  # unknown tools fail immediately without touching anything
+    return tool.method == "GET" or name in _CACHEABLE_TOOLS or name in _READ_ONLY_POST_TOOLS
+
+
+async def _execute_safely(name: str, args: dict[str, Any]) -> ToolResult:
+    """execute_tool, but unexpected exceptions become error results instead of propagating."""
+    t0 = time.perf_counter()
+    try:
+        return await execute_tool(name, args)
+    except Exception as e:
+        msg = f"Tool execution failed: {e}"
+        duration_ms = int((time.perf_counter() - t0) * 1000)
+        return ToolResult(content=msg, status="error", error=msg, duration_ms=duration_ms)
+
+
+async def _execute_after(
+    prev: asyncio.Task | None, name: str, args: dict[str, Any]
+) -> ToolResult:
+    if prev is not None:
+        await asyncio.wait([prev])
+    return await _execute_safely(name, args)
+
+
+def schedule_tools(calls: list[tuple[str, dict[str, Any]]]) -> list[asyncio.Task]:
+    """Start one turn's tool calls and return one task per call, in call order.
+
+    Read-only calls start immediately and overlap each other; identical read calls
+    (same name and args) share one task, so the same object may appear more than once.
+    Mutating calls are chained so they run one at a time in the order the model emitted
+    them (still overlapping the reads). Tasks never raise — failures come back as error
+    ToolResults.
+    """
+    tasks: list[asyncio.Task] = []
+    reads: dict[tuple, asyncio.Task] = {}
+    last_write: asyncio.Task | None = None
+    for name, args in calls:
+        if is_read_only(name):
+            sig = tool_sig(name, args)
+            task = reads.get(sig)
+            if task is None:
+                task = reads[sig] = asyncio.create_task(_execute_safely(name, args))
+        else:
+            task = asyncio.create_task(_execute_after(last_write, name, args))
+            last_write = task
+        tasks.append(task)
+    return tasks
+
+
 async def _execute_internal(name: str, args: dict[str, Any], t0: float) -> ToolResult:
     """Handle internal tools that don't call the gateway."""
     def _ms() -> int:
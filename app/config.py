@@ -20,15 +20,19 @@ class Settings(BaseSettings):
     anthropic_api_key: str = ""
     haiku_model: str = "claude-haiku-4-5-20251001"
     sonnet_model: str = "claude-sonnet-4-6"
+    anthropic_keepalive_seconds: float = 60.0  # Idle time before a pooled API connection is closed
 
     # Postgres (Cloud SQL or local)
     database_url: str = ""
+    pg_pool_min: int = 5  # Connections kept open (PG_POOL_MIN in .env)
+    pg_pool_max: int = 20  # Keep below the server's max_connections (PG_POOL_MAX)
 
     # KB ingestion
     conversations_folder_id: str = "109Nh8yA11PpQ4iWbJ6LHGIL-2roCn5Ok"  # Drive folder ID for Knowledge Base/Conversations/
 
     # Feature flags
     session_summarization: bool = True  # Generate agent_memory summary after each session
+    session_fused_processing: bool = True  # One Haiku call for facts + summaries
 
     # Context window
     session_window_size: int = 15  # Recent messages to keep verbatim; older messages are compressed
@@ -36,14 +40,34 @@ class Settings(BaseSettings):
     # Agent loop
     agent_max_turns: int = 20  # Maximum tool-call turns per request (AGENT_MAX_TURNS in .env)
     turn_timeout_seconds: int = 300  # Max seconds per LLM call before timing out (TURN_TIMEOUT_SECONDS in .env)
+    sse_keepalive_seconds: int = 15  # Idle seconds before /chat/stream sends a keep-alive comment
 
     # Tool result cache
     tool_cache_ttl_seconds: int = 60  # TTL for read-only tool result cache (TOOL_CACHE_TTL_SECONDS in .env)
 
-    # Model routing — Haiku by default, escalate to Sonnet based on these signals
-    sonnet_turn_threshold: int = 2          # Turn index at which all remaining turns use Sonnet
-    sonnet_message_len_threshold: int = 500  # User message char count that signals Sonnet on turn 0
-    sonnet_write_tools: list[str] = [        # Any of these in prior turns forces Sonnet for all subsequent turns
+    # Memory cache
+    memory_cache_ttl_seconds: int = 60  # TTL for prompt memory lookups; cleared on any memory write
+
+    # Session processing
+    llm_cache_ttl_seconds: int = 3600  # TTL for exact-match reuse of identical Haiku prompts
+    summary_max_chars: int = 40_000  # Summaries elide middle messages past this
+    extraction_fact_limit: int = 60  # Existing facts shown to extraction, most relevant first
+    haiku_max_concurrency: int = 4  # In-flight Haiku calls from session processing
+    memory_upsert_concurrency: int = 8  # Concurrent fact upserts; keep below pg_pool_max
+    session_batch_min_sessions: int = 10  # Archives this large use the Batches API
+    session_batch_timeout_seconds: float = 1800.0  # Then cancel; the rest runs online
+    archive_max_sessions: int = 10_000  # Per archive call, oldest first
+
+    # Session history cache
+    history_cache_size: int = 256  # Warm sessions kept in-process; validated against message_count
+
+    # Model routing — Haiku by default, escalate to Sonnet based on these signals.
+    # The model only changes between user turns, so each request keeps one prompt cache.
+    sonnet_turn_threshold: int = 2          # Tool loops reaching this turn index escalate the session
+    sonnet_message_len_threshold: int = 500  # User message char count that signals Sonnet
+    sonnet_context_chars_threshold: int = 60_000  # Total context chars that signal Sonnet
+    sticky_session_model: bool = True  # Stay on Sonnet after escalating (warm cache)
+    sonnet_write_tools: list[str] = [        # Any of these used escalates the session
         # Calendar
         "create_event", "update_event", "delete_event",
         # Tasks
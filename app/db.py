@@ -28,6 +28,7 @@ ALTER TABLE sessions ADD COLUMN IF NOT EXISTS context_summary TEXT;
 ALTER TABLE sessions ADD COLUMN IF NOT EXISTS summarized_through INT DEFAULT 0;
 ALTER TABLE sessions ADD COLUMN IF NOT EXISTS session_type TEXT DEFAULT 'chat';
 ALTER TABLE sessions ADD COLUMN IF NOT EXISTS title TEXT;
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS model TEXT;
 
 CREATE TABLE IF NOT EXISTS messages (
     id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -40,6 +41,18 @@ CREATE TABLE IF NOT EXISTS messages (
 CREATE INDEX IF NOT EXISTS messages_session_id_timestamp_idx
     ON messages (session_id, timestamp);
 
+-- message_count is only ever incremented by the message INSERT; re-derive it for sessions
+-- whose count drifted before that (or is NULL), so the history cache can validate them.
+-- Idempotent — once counts match, this rewrites nothing.
+UPDATE sessions
+SET message_count = counts.n
+FROM (
+    SELECT ss.id, COUNT(m.id)::int AS n
+    FROM sessions ss LEFT JOIN messages m ON m.session_id = ss.id
+    GROUP BY ss.id
+) counts
+WHERE sessions.id = counts.id AND sessions.message_count IS DISTINCT FROM counts.n;
+
 CREATE TABLE IF NOT EXISTS archived_sessions (
     id                 UUID PRIMARY KEY,
     created_at         TIMESTAMPTZ,
@@ -75,6 +88,8 @@ CREATE TABLE IF NOT EXISTS agent_memory (
     UNIQUE (fact_type, key)
 );
 
+CREATE INDEX IF NOT EXISTS agent_memory_updated_at_idx ON agent_memory (updated_at DESC);
+
 CREATE TABLE IF NOT EXISTS action_logs (
     id            UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     session_id    UUID REFERENCES sessions(id) ON DELETE CASCADE,
@@ -104,7 +119,23 @@ async def init_pool() -> None:
     dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
 
     logger.info("Connecting to PostgreSQL...")
-    _pool = await asyncpg.create_pool(dsn=dsn, min_size=2, max_size=10)
+    # Larger statement cache: the hot paths reuse a fixed set of module-level SQL strings,
+    # so each connection parses/plans them once and then runs the cached prepared statement.
+    # Server-side TCP keepalives let Postgres notice connections dropped by NAT/proxies, and
+    # idle connections are recycled after max_inactive_connection_lifetime.
+    _pool = await asyncpg.create_pool(
+        dsn=dsn,
+        min_size=settings.pg_pool_min,
+        max_size=settings.pg_pool_max,
+        statement_cache_size=1024,
+        max_cacheable_statement_size=64 * 1024,
+        max_inactive_connection_lifetime=300.0,
+        server_settings={
+            "tcp_keepalives_idle": "60",
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "3",
+        },
+    )
 
     async with _pool.acquire() as conn:
         await conn.execute(_SCHEMA_SQL)
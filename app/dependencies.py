@@ -1,5 +1,7 @@
 """Shared dependencies for FastAPI routes."""
 
+import hmac
+
 from fastapi import HTTPException, Request
 
 from app.config import settings
@@ -17,8 +19,9 @@ def verify_api_key(request: Request) -> None:
     key: str | None = request.headers.get("X-API-Key")
     if not key:
         auth = request.headers.get("Authorization") or ""
-        if auth.lower().startswith("bearer "):
+        if auth[:7].lower() == "bearer ":
             key = auth[7:].strip()
 
-    if not key or key != settings.api_key:
+    # Constant-time compare; bytes, since compare_digest rejects non-ASCII str
+    if not key or not hmac.compare_digest(key.encode(), settings.api_key.encode()):
         raise HTTPException(401, "Invalid or missing API key")
@@ -0,0 +1,33 @@
+"""Shared HTTP client for the upstream gateway."""
+
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_gateway_client() -> httpx.AsyncClient:
+    """Return the shared gateway client, creating it on first use.
+
+    One pooled client for every gateway call keeps connections (and their TLS sessions)
+    alive between requests instead of handshaking per call.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _client
+
+
+async def close_gateway_client() -> None:
+    """Close the client on shutdown."""
+    global _client
+    if _client:
+        await _client.aclose()
+        _client = None
+        logger.info("Gateway client closed")
@@ -6,9 +6,12 @@ from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.agent.client import close_client, warmup
+from app.agent.tools import TOOLS, tool_schema_fingerprint
 from app.config import settings
 from app.db import close_pool, init_pool
 from app.dependencies import verify_api_key
+from app.gateway import close_gateway_client
 from app.routers import audit, chat, conversations, finance, health, kb, memory, think, tools
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,13 @@ def _configure_logging() -> None:
 async def lifespan(app: FastAPI):
     _configure_logging()
     await init_pool()
+    await warmup()
+    logger.info(f"{len(TOOLS)} tools loaded, schema fingerprint {tool_schema_fingerprint()}")
+    # Everything here wraps /chat/stream too; none of it may buffer response bodies
+    logger.info(f"Middleware: {', '.join(m.cls.__name__ for m in app.user_middleware) or 'none'}")
     yield
+    await close_client()
+    await close_gateway_client()
     await close_pool()
 
 
@@ -45,32 +54,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Health is public; all other routes require API key when API_KEY is set
+# Health is public; all other routes require API key when API_KEY is set.
+# With no key configured the dependency is left off entirely rather than run as a no-op.
+_auth = [Depends(verify_api_key)] if settings.api_key else []
+
 app.include_router(health.router)
 app.include_router(
-    chat.router, prefix="/chat", tags=["chat"], dependencies=[Depends(verify_api_key)]
+    chat.router, prefix="/chat", tags=["chat"], dependencies=_auth
 )
 app.include_router(
     conversations.router,
     prefix="/conversations",
     tags=["conversations"],
-    dependencies=[Depends(verify_api_key)],
+    dependencies=_auth,
 )
 app.include_router(
-    memory.router, prefix="/memory", tags=["memory"], dependencies=[Depends(verify_api_key)]
+    memory.router, prefix="/memory", tags=["memory"], dependencies=_auth
 )
 app.include_router(
-    kb.router, prefix="/kb", tags=["kb"], dependencies=[Depends(verify_api_key)]
+    kb.router, prefix="/kb", tags=["kb"], dependencies=_auth
 )
 app.include_router(
-    tools.router, prefix="/tools", tags=["tools"], dependencies=[Depends(verify_api_key)]
+    tools.router, prefix="/tools", tags=["tools"], dependencies=_auth
 )
 app.include_router(
-    audit.router, prefix="/audit", tags=["audit"], dependencies=[Depends(verify_api_key)]
+    audit.router, prefix="/audit", tags=["audit"], dependencies=_auth
 )
 app.include_router(
-    finance.router, prefix="/finance", tags=["finance"], dependencies=[Depends(verify_api_key)]
+    finance.router, prefix="/finance", tags=["finance"], dependencies=_auth
 )
 app.include_router(
-    think.router, prefix="/think", tags=["think"], dependencies=[Depends(verify_api_key)]
+    think.router, prefix="/think", tags=["think"], dependencies=_auth
 )
@@ -1,12 +1,15 @@
 """Chat endpoint — main agent interface."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.agent.loop import run_turn, run_turn_stream
+from app.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -31,15 +34,58 @@ class ChatResponse(BaseModel):
     response: str
 
 
-@router.post("", response_model=ChatResponse)
+_KEEPALIVE = b": keepalive\n\n"
+_END = object()
+
+
+async def _with_keepalive(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Relay SSE frames through a bounded queue, sending a comment line while idle.
+
+    Long tool calls and model thinking can leave the stream silent for minutes; the
+    keep-alive stops proxies from timing it out and surfaces dead clients on the next
+    write. The queue caps how far the agent can run ahead of a slow reader.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+
+    async def pump() -> None:
+        try:
+            async for frame in frames:
+                await queue.put(frame)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_END)
+
+    producer = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=settings.sse_keepalive_seconds)
+            except TimeoutError:
+                yield _KEEPALIVE
+                continue
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+
+
+# The response is built from values the agent loop already produced; constructing it without
+# validation and serializing it directly skips FastAPI's response_model round-trip.
+# The model is still documented in OpenAPI via responses=.
+@router.post("", response_class=Response, responses={200: {"model": ChatResponse}})
 async def chat(body: ChatRequest):
     if not body.message.strip():
         raise HTTPException(400, "Message cannot be empty")
 
-    logger.debug(f"POST /chat: session={body.session_id}, message='{body.message[:120]}'")
+    logger.debug("POST /chat: session=%s, message='%.120s'", body.session_id, body.message)
     session_id, response_text = await run_turn(body.session_id, body.message, body.mode, body.timezone, body.location)
-    logger.debug(f"POST /chat: done, session={session_id}, response='{response_text[:120]}'")
-    return ChatResponse(session_id=session_id, response=response_text)
+    logger.debug("POST /chat: done, session=%s, response='%.120s'", session_id, response_text)
+    payload = ChatResponse.model_construct(session_id=session_id, response=response_text)
+    return Response(payload.model_dump_json(), media_type="application/json")
 
 
 @router.post("/stream")
@@ -47,12 +93,14 @@ async def chat_stream(body: ChatRequest):
     if not body.message.strip():
         raise HTTPException(400, "Message cannot be empty")
 
-    logger.debug(f"POST /chat/stream: session={body.session_id}, message='{body.message[:120]}'")
+    logger.debug("POST /chat/stream: session=%s, message='%.120s'", body.session_id, body.message)
     return StreamingResponse(
-        run_turn_stream(body.session_id, body.message, body.mode, body.timezone, body.location),
+        _with_keepalive(
+            run_turn_stream(body.session_id, body.message, body.mode, body.timezone, body.location)
+        ),
         media_type="text/event-stream",
         headers={
-            "Cache-Control": "no-cache",
+            "Cache-Control": "no-cache, no-transform",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
         },
@@ -2,12 +2,14 @@
 
 import json
 import logging
-from datetime import timezone
+from datetime import timedelta, timezone
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from app.agent.loop import get_session, list_sessions
-from app.agent.session import process_session
+from app.agent.loop import get_session, list_sessions, stream_session
+from app.agent.session import process_session, process_sessions_bulk
+from app.config import settings
 from app.db import get_pool
 
 logger = logging.getLogger(__name__)
@@ -20,16 +22,19 @@ def _to_utc(ts):
 
 
 @router.get("")
-async def list_conversations():
-    return {"conversations": await list_sessions()}
+async def list_conversations(
+    limit: int | None = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    return {"conversations": await list_sessions(limit, offset)}
 
 
 @router.get("/{session_id}")
 async def get_conversation(session_id: str):
-    messages = await get_session(session_id)
-    if messages is None:
+    body = await stream_session(session_id)
+    if body is None:
         raise HTTPException(404, "Session not found")
-    return {"session_id": session_id, "messages": messages, "message_count": len(messages)}
+    return StreamingResponse(body, media_type="application/json")
 
 
 @router.post("/{session_id}/process")
@@ -42,11 +47,53 @@ async def trigger_process_session(session_id: str):
     return await process_session(session_id, messages)
 
 
+# One statement: the data-modifying CTEs share a snapshot and run atomically, so the
+# copies and the delete (which cascades to messages) need no explicit transaction.
+# Victims are capped and row-locked with SKIP LOCKED, so overlapping archive calls
+# split the work instead of blocking on each other; nothing to archive is a no-op.
+# Kept as a module constant so asyncpg's per-connection statement cache reuses its plan.
+_ARCHIVE_SQL = """
+    WITH victims AS (
+        SELECT id FROM sessions
+        WHERE last_activity < NOW() - $1::interval
+        ORDER BY last_activity
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    ),
+    copied_sessions AS (
+        INSERT INTO archived_sessions
+            (id, created_at, last_activity, message_count, processed_at,
+             summary_kb_id, context_summary, summarized_through)
+        SELECT id, created_at, last_activity, message_count, processed_at,
+               summary_kb_id, context_summary, summarized_through
+        FROM sessions
+        WHERE id IN (SELECT id FROM victims)
+        ON CONFLICT (id) DO NOTHING
+    ),
+    copied_messages AS (
+        INSERT INTO archived_messages (id, session_id, role, content, timestamp)
+        SELECT id, session_id, role, content, timestamp
+        FROM messages
+        WHERE session_id IN (SELECT id FROM victims)
+        ON CONFLICT (id) DO NOTHING
+        RETURNING 1
+    ),
+    deleted AS (
+        DELETE FROM sessions
+        WHERE id IN (SELECT id FROM victims)
+        RETURNING id, created_at, last_activity
+    )
+    SELECT id, created_at, last_activity,
+           (SELECT COUNT(*) FROM copied_messages) AS messages_archived
+    FROM deleted
+"""
+
+
 @router.post("/archive")
 async def archive_sessions(
     older_than_days: int = Query(default=30, ge=1, description="Archive sessions with no activity in this many days"),
 ):
-    """Move old sessions and their messages to archive tables in a single transaction.
+    """Move old sessions and their messages to archive tables in a single statement.
 
     Deleting from sessions cascades to messages automatically, so the live
     tables stay lean while all data is preserved in archived_sessions and
@@ -54,67 +101,33 @@ async def archive_sessions(
     """
     pool = get_pool()
 
-    async with pool.acquire() as conn:
-        async with conn.transaction():
-            # Identify sessions to archive
-            session_rows = await conn.fetch(
-                """
-                SELECT id, created_at, last_activity FROM sessions
-                WHERE last_activity < NOW() - ($1 || ' days')::INTERVAL
-                """,
-                str(older_than_days),
-            )
-
-            if not session_rows:
-                return {"sessions_archived": 0, "messages_archived": 0}
-
-            session_ids = [r["id"] for r in session_rows]
-            session_timestamps = {r["id"]: r["last_activity"] for r in session_rows}
-            session_created = {r["id"]: r["created_at"] for r in session_rows}
-
-            # Copy sessions to archive
-            await conn.execute(
-                """
-                INSERT INTO archived_sessions
-                    (id, created_at, last_activity, message_count, processed_at,
-                     summary_kb_id, context_summary, summarized_through)
-                SELECT id, created_at, last_activity, message_count, processed_at,
-                       summary_kb_id, context_summary, summarized_through
-                FROM sessions
-                WHERE id = ANY($1)
-                ON CONFLICT (id) DO NOTHING
-                """,
-                session_ids,
-            )
+    session_rows = await pool.fetch(
+        _ARCHIVE_SQL, timedelta(days=older_than_days), settings.archive_max_sessions
+    )
 
-            # Copy messages to archive
-            result = await conn.fetchrow(
-                """
-                WITH moved AS (
-                    INSERT INTO archived_messages (id, session_id, role, content, timestamp)
-                    SELECT id, session_id, role, content, timestamp
-                    FROM messages
-                    WHERE session_id = ANY($1)
-                    ON CONFLICT (id) DO NOTHING
-                    RETURNING 1
-                )
-                SELECT COUNT(*) AS count FROM moved
-                """,
-                session_ids,
-            )
-            messages_archived = result["count"]
+    if not session_rows:
+        return {"sessions_archived": 0, "messages_archived": 0}
 
-            # Delete from live sessions — cascades to messages automatically
-            await conn.execute(
-                "DELETE FROM sessions WHERE id = ANY($1)",
-                session_ids,
-            )
+    session_ids = [r["id"] for r in session_rows]
+    session_timestamps = {r["id"]: r["last_activity"] for r in session_rows}
+    session_created = {r["id"]: r["created_at"] for r in session_rows}
+    messages_archived = session_rows[0]["messages_archived"]
 
-    # Process each archived session sequentially — write summary to Drive and sync KB.
+    # Process the archived sessions — write summaries to Drive and sync KB.
     # Runs outside the transaction so a Drive failure never rolls back the DB archive.
     kb_succeeded = 0
     kb_failed = 0
     kb_errors: list[str] = []
+
+    def _tally(sid, result: dict) -> None:
+        nonlocal kb_succeeded, kb_failed
+        if result.get("kb_ingested"):
+            kb_succeeded += 1
+        elif result.get("kb_error"):
+            kb_failed += 1
+            kb_errors.append(f"{sid}: {result['kb_error']}")
+
+    sessions = []
     for sid in session_ids:
         async with pool.acquire() as conn:
             msg_rows = await conn.fetch(
@@ -126,17 +139,23 @@ async def archive_sessions(
         session_dt = _to_utc(session_timestamps[sid])
         created_at = session_created.get(sid)
         session_start = _to_utc(created_at) if created_at else None
-        try:
-            result = await process_session(sid, messages, session_dt=session_dt, session_start=session_start)
-            if result.get("kb_ingested"):
-                kb_succeeded += 1
-            elif result.get("kb_error"):
+        sessions.append((sid, messages, session_dt, session_start))
+
+    if len(sessions) >= settings.session_batch_min_sessions:
+        # Large runs aren't latency-sensitive — batch the Haiku work at half price
+        for (sid, *_), result in zip(sessions, await process_sessions_bulk(sessions)):
+            _tally(sid, result)
+    else:
+        for sid, messages, session_dt, session_start in sessions:
+            try:
+                result = await process_session(
+                    sid, messages, session_dt=session_dt, session_start=session_start
+                )
+                _tally(sid, result)
+            except Exception as e:
                 kb_failed += 1
-                kb_errors.append(f"{sid}: {result['kb_error']}")
-        except Exception as e:
-            kb_failed += 1
-            kb_errors.append(f"{sid}: {e}")
-            logger.error(f"process_session failed for archived session {sid}: {e}")
+                kb_errors.append(f"{sid}: {e}")
+                logger.error(f"process_session failed for archived session {sid}: {e}")
 
     response: dict = {
         "sessions_archived": len(session_ids),
@@ -1,9 +1,14 @@
 """KB proxy — forwards /kb/* requests to the api-gateway."""
 
+import asyncio
+from collections.abc import AsyncIterator
+
 import httpx
 from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from app.config import settings
+from app.gateway import get_gateway_client
 
 router = APIRouter(tags=["kb"])
 
@@ -18,41 +23,88 @@ def _headers() -> dict[str, str]:
     return {"X-API-Key": settings.gateway_api_key}
 
 
-async def _proxy(method: str, path: str, **kwargs) -> Response:
-    """Forward a request to the api-gateway and return the raw response."""
+async def _proxy(method: str, path: str, request: Request | None = None, **kwargs) -> Response:
+    """Forward a request to the api-gateway and stream the response back.
+
+    The upstream body is passed through chunk by chunk rather than buffered, so large
+    listings and search results cost constant memory. Chunks are decoded first: the
+    gateway's Content-Encoding answers httpx's Accept-Encoding, not the caller's.
+    When the caller's request is given, its If-None-Match is forwarded so the gateway can
+    answer 304, and the gateway's ETag is passed back for the next revalidation.
+    """
     if not settings.gateway_url:
         raise HTTPException(503, "Gateway URL not configured")
+    headers = _headers()
+    if request is not None and (inm := request.headers.get("if-none-match")):
+        headers["If-None-Match"] = inm
+    client = get_gateway_client()
+    req = client.build_request(
+        method, _gateway_url(path), headers=headers, timeout=_TIMEOUT, **kwargs
+    )
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.request(
-                method, _gateway_url(path), headers=_headers(), **kwargs
-            )
+        resp = await client.send(req, stream=True)
     except httpx.TimeoutException:
         raise HTTPException(504, "Gateway timed out")
     except httpx.RequestError as e:
         raise HTTPException(502, f"Gateway unreachable: {e}")
 
-    return Response(
-        content=resp.content,
+    async def body() -> AsyncIterator[bytes]:
+        # Closed here rather than in a background task, which Starlette skips when the
+        # client disconnects mid-body — that would leak a gateway pool connection
+        try:
+            async for chunk in resp.aiter_bytes():
+                yield chunk
+        finally:
+            await resp.aclose()
+
+    etag = resp.headers.get("etag")
+    return StreamingResponse(
+        body(),
         status_code=resp.status_code,
         media_type=resp.headers.get("content-type", "application/json"),
+        headers={"ETag": etag} if etag else None,
     )
 
 
-
 @router.get("/stats")
-async def kb_stats():
-    return await _proxy("GET", "/kb/stats")
+async def kb_stats(request: Request):
+    return await _proxy("GET", "/kb/stats", request)
 
 
 @router.get("/sources")
-async def kb_sources():
-    return await _proxy("GET", "/kb/sources")
+async def kb_sources(request: Request):
+    return await _proxy("GET", "/kb/sources", request)
 
 
 @router.get("/files")
-async def kb_files():
-    return await _proxy("GET", "/kb/files")
+async def kb_files(request: Request):
+    return await _proxy("GET", "/kb/files", request)
+
+
+
+@router.get("/summary")
+async def kb_summary():
+    """Stats, sources and files in one response, fetched from the gateway concurrently."""
+    if not settings.gateway_url:
+        raise HTTPException(503, "Gateway URL not configured")
+    client = get_gateway_client()
+    try:
+        stats, sources, files = await asyncio.gather(*(
+            client.get(_gateway_url(path), headers=_headers(), timeout=_TIMEOUT)
+            for path in ("/kb/stats", "/kb/sources", "/kb/files")
+        ))
+    except httpx.TimeoutException:
+        raise HTTPException(504, "Gateway timed out")
+    except httpx.RequestError as e:
+        raise HTTPException(502, f"Gateway unreachable: {e}")
+
+    for resp in (stats, sources, files):
+        if resp.is_error:
+            raise HTTPException(502, f"Gateway error {resp.status_code} from {resp.url.path}")
+    try:
+        return {"stats": stats.json(), "sources": sources.json(), "files": files.json()}
+    except ValueError:
+        raise HTTPException(502, "Gateway returned a non-JSON response")
 
 
 
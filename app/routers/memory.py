@@ -1,9 +1,9 @@
 """Structured memory (agent_memory) endpoints."""
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from app.agent.memory import delete_fact, load_memory, upsert_fact
+from app.agent.memory import delete_fact, load_memory, upsert_fact, upsert_facts
 
 router = APIRouter()
 
@@ -15,6 +15,10 @@ class UpsertMemoryRequest(BaseModel):
     confidence: float = 1.0
 
 
+class UpsertMemoryBulkRequest(BaseModel):
+    facts: list[UpsertMemoryRequest] = Field(max_length=1000)
+
+
 @router.get("")
 async def list_memory():
     facts = await load_memory()
@@ -32,6 +36,14 @@ async def upsert_memory(body: UpsertMemoryRequest):
     )
 
 
+@router.put("/bulk")
+async def upsert_memory_bulk(body: UpsertMemoryBulkRequest):
+    count = await upsert_facts(
+        [(f.fact_type, f.key, f.value, f.confidence) for f in body.facts], source="api"
+    )
+    return {"upserted": count}
+
+
 @router.delete("/{memory_id}")
 async def delete_memory(memory_id: str):
     if not await delete_fact(memory_id):
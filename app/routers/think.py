@@ -2,7 +2,7 @@
 
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
 from app.agent.think_loop import run_think
@@ -24,11 +24,16 @@ class ThinkResponse(BaseModel):
     summary: str
 
 
-@router.post("", response_model=ThinkResponse)
+@router.post("", response_class=Response, responses={200: {"model": ThinkResponse}})
 async def think(body: ThinkRequest):
     logger.debug(f"POST /think: context={body.context}, trigger={body.trigger}")
     session_id, acted, summary = await run_think(
         body.session_id, body.context, body.trigger, body.timezone
     )
-    logger.debug(f"POST /think: done, acted={acted}, summary='{summary[:120]}'")
-    return ThinkResponse(session_id=session_id, acted=acted, summary=summary)
+    logger.debug("POST /think: done, acted=%s, summary='%.120s'", acted, summary)
+    return Response(
+        ThinkResponse.model_construct(
+            session_id=session_id, acted=acted, summary=summary
+        ).model_dump_json(),
+        media_type="application/json",
+    )
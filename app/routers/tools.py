@@ -1,7 +1,9 @@
 """Tools registry endpoint — exposes the agent's available tools as JSON."""
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+import hashlib
+
+from fastapi import APIRouter, Request, Response
+from pydantic import BaseModel, TypeAdapter
 
 from app.agent.tools import TOOLS, ToolDef
 
@@ -45,17 +47,27 @@ def _parameters(tool: ToolDef) -> list[ToolParameter]:
     ]
 
 
-@router.get("", response_model=list[ToolInfo])
-def list_tools():
+def _tool_info(tool: ToolDef) -> ToolInfo:
+    return ToolInfo(
+        name=tool.name,
+        description=tool.description,
+        category=_category(tool),
+        method=tool.method,
+        endpoint=tool.endpoint,
+        parameters=_parameters(tool),
+    )
+
+
+# TOOLS is fixed at import time, so validate and serialize the listing once
+_TOOLS_JSON: bytes = TypeAdapter(list[ToolInfo]).dump_json([_tool_info(t) for t in TOOLS])
+_TOOLS_ETAG = f'"{hashlib.blake2b(_TOOLS_JSON, digest_size=8).hexdigest()}"'
+
+
+@router.get("", response_class=Response, responses={200: {"model": list[ToolInfo]}})
+def list_tools(request: Request):
     """Return all tools available to the agent, grouped with parameter details."""
-    return [
-        ToolInfo(
-            name=t.name,
-            description=t.description,
-            category=_category(t),
-            method=t.method,
-            endpoint=t.endpoint,
-            parameters=_parameters(t),
-        )
-        for t in TOOLS
-    ]
+    if request.headers.get("if-none-match") == _TOOLS_ETAG:
+        return Response(status_code=304, headers={"ETag": _TOOLS_ETAG})
+    return Response(
+        content=_TOOLS_JSON, media_type="application/json", headers={"ETag": _TOOLS_ETAG}
+    )
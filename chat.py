@@ -18,32 +18,29 @@ if API_KEY:
 print("Sazed — ctrl+c to exit")
 print(f"Connecting to {BASE}\n")
 
-while True:
-    try:
-        msg = input("You: ").strip()
-    except (KeyboardInterrupt, EOFError):
-        print("\nBye.")
-        break
-
-    if not msg:
-        continue
-
-    try:
-        resp = httpx.post(
-            f"{BASE}/chat",
-            json={"session_id": session_id, "message": msg},
-            headers=headers,
-            timeout=60.0,
-        )
-        resp.raise_for_status()
-    except httpx.HTTPStatusError as e:
-        print(f"[error {e.response.status_code}] {e.response.text}\n")
-        continue
-    except httpx.RequestError as e:
-        print(f"[connection error] {e}\n")
-        continue
-
-    data = resp.json()
-    session_id = data["session_id"]
-    print(f"\nSazed: {data['response']}")
-    print(f"[session: {session_id[:8]}...]\n")
+# One client for the whole session so every turn reuses the same keep-alive connection
+with httpx.Client(base_url=BASE, headers=headers, timeout=60.0) as client:
+    while True:
+        try:
+            msg = input("You: ").strip()
+        except (KeyboardInterrupt, EOFError):
+            print("\nBye.")
+            break
+
+        if not msg:
+            continue
+
+        try:
+            resp = client.post("/chat", json={"session_id": session_id, "message": msg})
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            print(f"[error {e.response.status_code}] {e.response.text}\n")
+            continue
+        except httpx.RequestError as e:
+            print(f"[connection error] {e}\n")
+            continue
+
+        data = resp.json()
+        session_id = data["session_id"]
+        print(f"\nSazed: {data['response']}")
+        print(f"[session: {session_id[:8]}...]\n")